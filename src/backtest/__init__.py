@@ -1,7 +1,23 @@
 # Backtesting Module for IDX Swing Trading Strategy
-from .engine import BacktestEngine
-from .portfolio import Portfolio
-from .metrics import PerformanceMetrics
-from .reports import BacktestReport
+# Submodules load on first use, so importing e.g. src.backtest.portfolio
+# doesn't also pull in pandas via the engine and reports
+import importlib
 
-__all__ = ['BacktestEngine', 'Portfolio', 'PerformanceMetrics', 'BacktestReport']
\ No newline at end of file
+_EXPORTS = {
+    'BacktestEngine': 'engine',
+    'Portfolio': 'portfolio',
+    'PerformanceMetrics': 'metrics',
+    'BacktestReport': 'reports'
+}
+
+__all__ = ['BacktestEngine', 'Portfolio', 'PerformanceMetrics', 'BacktestReport']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,37 @@
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 
 from .. import config, data, strategy
+from ..progress import progress
 from .portfolio import Portfolio
-from .metrics import PerformanceMetrics
+from .metrics import PerformanceMetrics, PNL_DTYPE
+from .simulation import simulate_trades, EXIT_REASONS
+
+# Column schema of closed-trade records (see Portfolio.open/close_position)
+TRADE_COLUMNS = [
+    'ticker', 'shares', 'entry_price', 'entry_value', 'entry_time',
+    'stop_loss', 'take_profit', 'commission', 'current_price',
+    'unrealized_pnl', 'realized_pnl', 'duration_days',
+    'exit_price', 'exit_value', 'exit_time', 'exit_reason'
+]
+TRADE_DTYPES = {
+    'shares': np.int64,
+    'entry_price': np.float64,
+    'entry_value': np.float64,
+    'stop_loss': np.float64,
+    'take_profit': np.float64,
+    'commission': np.float64,
+    'current_price': np.float64,
+    'unrealized_pnl': np.float64,
+    'realized_pnl': np.float64,
+    'duration_days': np.int64,
+    'exit_price': np.float64,
+    'exit_value': np.float64
+}
 
 
 class BacktestEngine:
@@ -17,7 +43,8 @@ class BacktestEngine:
                  start_date: str = "2022-01-01",
                  end_date: str = "2024-12-31",
                  initial_cash: float = 100000000,
-                 commission: float = 0.002):
+                 commission: float = 0.002,
+                 workers: Optional[int] = None):
         """
         Initialize backtesting engine
         
@@ -26,15 +53,26 @@ class BacktestEngine:
             end_date: Backtest end date (YYYY-MM-DD)
             initial_cash: Starting capital in IDR
             commission: Commission rate per trade
+            workers: Worker processes for per-ticker backtests
+                     (None = config.BACKTEST_WORKERS, 1 = run in-process)
         """
         self.start_date = start_date
         self.end_date = end_date
         self.initial_cash = initial_cash
         self.commission = commission
+        if workers is None:
+            workers = config.BACKTEST_WORKERS or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f'workers must be at least 1, got {workers}')
+        self.workers = workers
+        self._metrics = None
         
-        # Initialize portfolio and metrics
-        self.portfolio = Portfolio(initial_cash)
-        self.metrics = PerformanceMetrics()
+    @property
+    def metrics(self) -> PerformanceMetrics:
+        """Performance metrics calculator, created on first use"""
+        if self._metrics is None:
+            self._metrics = PerformanceMetrics()
+        return self._metrics
         
     def run_backtest(self, tickers: List[str], **strategy_params) -> Dict:
         """
@@ -49,26 +87,50 @@ class BacktestEngine:
         """
         results = []
         
+        # Fetch every ticker up front with the batched downloader
+        dfs = data.fetch_data_batch(tickers,
+                                    interval="1d",
+                                    start_date=self.start_date,
+                                    end_date=self.end_date)
+        
+        ticker_data = []
         for ticker in tickers:
-            print(f"Backtesting {ticker}...", end="\r")
-            
-            # Fetch historical data
-            df = data.fetch_data(ticker, 
-                               period=None, 
-                               interval="1d",
-                               start_date=self.start_date,
-                               end_date=self.end_date)
-            
+            df = dfs.get(ticker)
             if df is None or df.empty:
                 print(f"No data available for {ticker}")
                 continue
+            ticker_data.append((ticker, df))
+        
+        pbar = progress(len(ticker_data), "Backtesting", unit="ticker")
+        if self.workers <= 1:
+            for ticker, df in ticker_data:
+                # Run individual backtest
+                result = self._run_single_backtest(ticker, df, **strategy_params)
+                pbar.update(1)
+                if result:
+                    results.append(result)
+        else:
+            # Tickers are independent, so simulate them in worker processes.
+            # Engine settings and strategy params are sent once per worker
+            # via the initializer, so each task only carries (ticker, df).
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_backtest_worker,
+                initargs=(self.start_date, self.end_date, self.initial_cash,
+                          self.commission, strategy_params)
+            ) as executor:
+                futures = [
+                    executor.submit(_run_single_backtest_worker, ticker, df)
+                    for ticker, df in ticker_data
+                ]
+                    
+                for future in futures:
+                    result = future.result()
+                    pbar.update(1)
+                    if result:
+                        results.append(result)
                 
-            # Run individual backtest
-            result = self._run_single_backtest(ticker, df, **strategy_params)
-            if result:
-                results.append(result)
-                
-        print(" " * 50, end="\r")  # Clear line
+        pbar.close()
         
         # Aggregate results
         if results:
@@ -79,94 +141,78 @@ class BacktestEngine:
     def _run_single_backtest(self, ticker: str, df: pd.DataFrame, **strategy_params) -> Optional[Dict]:
         """Run backtest for a single ticker using custom implementation"""
         try:
+            # Skip tickers without a single bar past the indicator warmup
+            warmup = strategy.min_history_bars() - 1
+            if len(df) <= warmup:
+                print(f"Not enough history to backtest {ticker}")
+                return None
+            
             # Initialize portfolio for this ticker
             portfolio = Portfolio(self.initial_cash)
             
             # List to store completed trades
             completed_trades = []
-            equity_curve = []
             
-            # Iterate through each day
-            for i in range(len(df)):
-                current_date = pd.to_datetime(df.index[i])
-                current_data = df.iloc[:i+1]  # Data up to current date
-                
-                if len(current_data) < max(config.SLOW_EMA, config.ATR_PERIOD, config.RSI_PERIOD):
-                    # Not enough data for analysis
-                    continue
-                
-                # Run strategy analysis on current data
-                analysis = strategy.analyze_ticker(current_data)
-                if not analysis:
+            # Compute indicators once over the full history; row i only
+            # depends on bars <= i so there is no look-ahead
+            indicators = strategy.precompute_indicators(df)
+            
+            # Pull columns out as plain arrays for the simulation kernel
+            dates = indicators.index
+            closes = indicators['Close'].to_numpy(dtype=np.float64)
+            setups = indicators['Is_Setup'].to_numpy(dtype=bool)
+            rsis = indicators['RSI'].to_numpy(dtype=np.float64)
+            vol_ratios = indicators['Vol_Ratio'].to_numpy(dtype=np.float64)
+            stop_losses = indicators['Stop_Loss'].to_numpy(dtype=np.float64)
+            take_profits = indicators['Take_Profit_Min'].to_numpy(dtype=np.float64)
+            
+            entry_signals = setups & self._validate_entry_signal(rsis, vol_ratios)
+            position_value = self.initial_cash * config.RISK_PER_TRADE * 10  # Risk 1%, 10:1 RR
+            
+            # Run the bar-by-bar state machine (JIT-compiled when numba is installed)
+            entry_idx, exit_idx, trade_shares, exit_codes, equity = simulate_trades(
+                closes, entry_signals, stop_losses, take_profits,
+                warmup, float(self.initial_cash), position_value, config.COMMISSION_RATE
+            )
+            
+            # Replay the trades through the portfolio to build trade records
+            py_dates = pd.DatetimeIndex(dates).to_pydatetime()
+            for entry, exit_, shares, code in zip(entry_idx, exit_idx, trade_shares, exit_codes):
+                portfolio.open_position(
+                    ticker=ticker,
+                    shares=int(shares),
+                    entry_price=float(closes[entry]),
+                    stop_loss=float(stop_losses[entry]),
+                    take_profit=float(take_profits[entry]),
+                    entry_time=py_dates[entry]
+                )
+                if exit_ < 0:
                     continue
-                
-                current_price = analysis['current_price']
-                
-                # Check for entry signals
-                if analysis['is_setup'] and not portfolio.positions:
-                    # Apply additional filters
-                    if self._validate_entry_signal(analysis):
-                        # Calculate position size
-                        position_value = self.initial_cash * config.RISK_PER_TRADE * 10  # Risk 1%, 10:1 RR
-                        shares = int(position_value / current_price / 100) * 100  # Round to lots
-                        
-                        # Check if we can afford this position
-                        cost = shares * current_price * (1 + config.COMMISSION_RATE)
-                        if cost <= portfolio.cash:
-                            # Open position
-                            position = portfolio.open_position(
-                                ticker=ticker,
-                                shares=shares,
-                                entry_price=current_price,
-                                stop_loss=analysis['stop_loss'],
-                                take_profit=analysis['take_profit_min'],
-                                entry_time=current_date.to_pydatetime() if hasattr(current_date, 'to_pydatetime') else current_date
-                            )
-                
-                # Check exit conditions for existing positions
-                if ticker in portfolio.positions:
-                    position = portfolio.positions[ticker]
-                    
-                    # Check if stop loss or take profit hit
-                    should_exit = False
-                    exit_reason = 'MANUAL'
-                    
-                    if current_price <= position['stop_loss']:
-                        should_exit = True
-                        exit_reason = 'STOP_LOSS'
-                    elif current_price >= position['take_profit']:
-                        should_exit = True
-                        exit_reason = 'TAKE_PROFIT'
-                    
-                    if should_exit:
-                        # Close position
-                        closed_position = portfolio.close_position(
-                            ticker=ticker,
-                            exit_price=current_price,
-                            exit_time=current_date.to_pydatetime() if hasattr(current_date, 'to_pydatetime') else current_date,
-                            exit_reason=exit_reason
-                        )
-                        if closed_position:
-                            completed_trades.append(closed_position)
-                
-                # Update portfolio
-                current_prices = {ticker: current_price}
-                portfolio.update_positions(current_prices, current_date.to_pydatetime() if hasattr(current_date, 'to_pydatetime') else current_date)
-                equity_curve.append({
-                    'date': current_date,
-                    'equity': portfolio.equity
-                })
+                if exit_ > entry:
+                    # Last mark-to-market before the exit bar
+                    portfolio.mark_position(ticker, float(closes[exit_ - 1]))
+                closed_position = portfolio.close_position(
+                    ticker=ticker,
+                    exit_price=float(closes[exit_]),
+                    exit_time=py_dates[exit_],
+                    exit_reason=EXIT_REASONS[code]
+                )
+                if closed_position:
+                    completed_trades.append(closed_position)
             
-            # Convert trades to DataFrame
-            if completed_trades:
-                trades_df = pd.DataFrame(completed_trades)
-            else:
-                trades_df = pd.DataFrame()
+            # Equity and drawdown come from the simulated curve
+            equity = equity[warmup:]
+            final_equity = float(equity[-1]) if len(equity) else self.initial_cash
+            max_drawdown = 0
+            if len(equity):
+                peak = np.maximum.accumulate(np.maximum(equity, self.initial_cash))
+                max_drawdown = max(0, float(((peak - equity) / peak * 100).max()))
             
-            # Convert equity curve to DataFrame
-            equity_df = pd.DataFrame(equity_curve)
-            if not equity_df.empty:
-                equity_df.set_index('date', inplace=True)
+            # Convert trades to DataFrame with a fixed column schema
+            trades_df = pd.DataFrame.from_records(completed_trades, columns=TRADE_COLUMNS).astype(TRADE_DTYPES)
+            
+            # Equity curve DataFrame straight from the simulated array
+            equity_df = pd.DataFrame({'equity': equity}, index=dates[warmup:].rename('date'))
             
             # Calculate metrics
             win_rate = self._calculate_win_rate(completed_trades)
@@ -180,10 +226,10 @@ class BacktestEngine:
                 'win_rate': win_rate,
                 'profit_factor': profit_factor,
                 'total_trades': len(completed_trades),
-                'final_equity': portfolio.equity,
-                'total_return': ((portfolio.equity - self.initial_cash) / self.initial_cash) * 100,
-                'max_drawdown': portfolio.max_drawdown,
-                'sharpe_ratio': self._calculate_sharpe_ratio(equity_df),
+                'final_equity': final_equity,
+                'total_return': ((final_equity - self.initial_cash) / self.initial_cash) * 100,
+                'max_drawdown': max_drawdown,
+                'sharpe_ratio': self._calculate_sharpe_ratio(equity),
                 'avg_trade_duration': self._calculate_avg_duration(completed_trades)
             }
             
@@ -191,52 +237,55 @@ class BacktestEngine:
             print(f"Error backtesting {ticker}: {e}")
             return None
     
-    def _validate_entry_signal(self, analysis: Dict) -> bool:
-        """Validate entry signal using additional filters"""
+    def _validate_entry_signal(self, rsi: np.ndarray, vol_ratio: np.ndarray) -> np.ndarray:
+        """Validate entry signals using additional filters (element-wise over bars)"""
         # RSI filter
-        rsi = analysis.get('rsi', 50)
-        if rsi > config.RSI_OVERBOUGHT or rsi < 40:
-            return False
+        rsi_ok = ~((rsi > config.RSI_OVERBOUGHT) | (rsi < 40))
             
         # Volume filter
-        vol_ratio = analysis.get('vol_ratio', 1.0)
-        if vol_ratio < config.VOL_RATIO_MIN:
-            return False
+        vol_ok = ~(vol_ratio < config.VOL_RATIO_MIN)
             
-        return True
+        return rsi_ok & vol_ok
+    
+    def _trade_pnls(self, trades: List[Dict]) -> np.ndarray:
+        """Extract realized P&L of each trade into an array"""
+        return np.fromiter((t.get('realized_pnl', 0.0) for t in trades),
+                           dtype=PNL_DTYPE, count=len(trades))
     
     def _calculate_win_rate(self, trades: List[Dict]) -> float:
         """Calculate win rate from trades list"""
         if not trades:
             return 0.0
-        winning_trades = len([t for t in trades if t.get('realized_pnl', 0) > 0])
-        return (winning_trades / len(trades)) * 100
+        pnl = self._trade_pnls(trades)
+        return float((pnl > 0).mean() * 100)
     
     def _calculate_profit_factor_trades(self, trades: List[Dict]) -> float:
         """Calculate profit factor from trades list"""
         if not trades:
             return 0.0
             
-        gross_wins = sum(t.get('realized_pnl', 0) for t in trades if t.get('realized_pnl', 0) > 0)
-        gross_losses = abs(sum(t.get('realized_pnl', 0) for t in trades if t.get('realized_pnl', 0) < 0))
+        pnl = self._trade_pnls(trades)
+        gross_wins = pnl[pnl > 0].sum()
+        gross_losses = abs(pnl[pnl < 0].sum())
         
         if gross_losses == 0:
             return float('inf') if gross_wins > 0 else 0
             
-        return gross_wins / gross_losses
+        return float(gross_wins / gross_losses)
     
-    def _calculate_sharpe_ratio(self, equity_df: pd.DataFrame) -> float:
-        """Calculate Sharpe ratio from equity curve"""
-        if equity_df.empty or len(equity_df) < 2:
+    def _calculate_sharpe_ratio(self, equity: np.ndarray) -> float:
+        """Calculate Sharpe ratio from equity curve values"""
+        if len(equity) < 3:
             return 0.0
             
-        returns = equity_df['equity'].pct_change().dropna()
-        if len(returns) == 0 or returns.std() == 0:
+        returns = np.diff(equity) / equity[:-1]
+        std = returns.std(ddof=1)
+        if std == 0:
             return 0.0
             
         # Annualized Sharpe ratio (assuming 252 trading days)
-        sharpe = (returns.mean() / returns.std()) * np.sqrt(252)
-        return sharpe
+        sharpe = (returns.mean() / std) * np.sqrt(252)
+        return float(sharpe)
     
     def _calculate_avg_duration(self, trades: List[Dict]) -> float:
         """Calculate average trade duration in days"""
@@ -261,13 +310,18 @@ class BacktestEngine:
         
     def _aggregate_results(self, results: List[Dict]) -> Dict:
         """Aggregate results from multiple tickers"""
+        # Extract per-ticker metrics into arrays in a single pass
+        keys = ('total_trades', 'total_return', 'win_rate', 'profit_factor', 'max_drawdown', 'sharpe_ratio')
+        values = np.array([[r[k] for k in keys] for r in results], dtype=np.float64)
+        trades, returns, win_rates, profit_factors, drawdowns, sharpes = values.T
+        
         # Portfolio-level metrics
-        total_trades = sum(r['total_trades'] for r in results)
-        total_return = np.mean([r['total_return'] for r in results])
-        avg_win_rate = np.mean([r['win_rate'] for r in results])
-        avg_profit_factor = np.mean([r['profit_factor'] for r in results if r['profit_factor'] != float('inf')])
-        max_drawdown = max(r['max_drawdown'] for r in results)
-        avg_sharpe = np.mean([r['sharpe_ratio'] for r in results if r['sharpe_ratio'] is not None])
+        total_trades = int(trades.sum())
+        total_return = returns.mean()
+        avg_win_rate = win_rates.mean()
+        avg_profit_factor = profit_factors[profit_factors != np.inf].mean()
+        max_drawdown = drawdowns.max()
+        avg_sharpe = sharpes[~np.isnan(sharpes)].mean()
         
         # Individual ticker results
         ticker_results = {r['ticker']: r for r in results}
@@ -282,6 +336,24 @@ class BacktestEngine:
             'max_drawdown': max_drawdown,
             'avg_sharpe_ratio': avg_sharpe,
             'ticker_results': ticker_results,
-            'successful_tickers': len([r for r in results if r['win_rate'] > 0.4]),
+            'successful_tickers': int((win_rates > 0.4).sum()),
             'total_tickers': len(results)
-        }
\ No newline at end of file
+        }
+
+
+# Per-process state set up by _init_backtest_worker
+_worker_engine = None
+_worker_strategy_params = {}
+
+
+def _init_backtest_worker(start_date: str, end_date: str, initial_cash: float,
+                          commission: float, strategy_params: Dict):
+    """Process pool initializer: build the engine once per worker process"""
+    global _worker_engine, _worker_strategy_params
+    _worker_engine = BacktestEngine(start_date, end_date, initial_cash, commission, workers=1)
+    _worker_strategy_params = strategy_params
+
+
+def _run_single_backtest_worker(ticker: str, df: pd.DataFrame) -> Optional[Dict]:
+    """Process pool entry point: run one ticker's backtest in this worker's engine"""
+    return _worker_engine._run_single_backtest(ticker, df, **_worker_strategy_params)
@@ -3,6 +3,10 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+# Trade P&L is summarized in float32: independent per-trade amounts in IDR
+# need far less than 7 significant digits. Equity stays float64.
+PNL_DTYPE = np.float32
+
 
 class PerformanceMetrics:
     """
@@ -26,38 +30,45 @@ class PerformanceMetrics:
         if trades.empty:
             return self._empty_metrics()
             
+        # Extract columns once and reuse the win/loss masks
+        pnl = trades['realized_pnl'].to_numpy(dtype=PNL_DTYPE)
+        win_mask = pnl > 0
+        loss_mask = pnl < 0
+        wins = pnl[win_mask]
+        losses = pnl[loss_mask]
+        num_trades = len(pnl)
+        
         # Win Rate
-        winning_trades = trades[trades['realized_pnl'] > 0]
-        losing_trades = trades[trades['realized_pnl'] < 0]
-        win_rate = len(winning_trades) / len(trades) * 100
+        win_rate = len(wins) / num_trades * 100
         
         # Profit Factor
-        gross_wins = winning_trades['realized_pnl'].sum()
-        gross_losses = abs(losing_trades['realized_pnl'].sum())
+        gross_wins = wins.sum()
+        gross_losses = abs(losses.sum())
         profit_factor = gross_wins / gross_losses if gross_losses > 0 else float('inf')
         
         # Average Trade Metrics
-        avg_win = winning_trades['realized_pnl'].mean() if not winning_trades.empty else 0
-        avg_loss = losing_trades['realized_pnl'].mean() if not losing_trades.empty else 0
-        avg_trade = trades['realized_pnl'].mean()
+        avg_win = wins.mean() if len(wins) else 0
+        avg_loss = losses.mean() if len(losses) else 0
+        avg_trade = pnl.mean()
         
         # Trade Duration
         if 'duration_days' in trades.columns:
-            avg_duration = trades['duration_days'].mean()
-            avg_winning_duration = winning_trades['duration_days'].mean() if not winning_trades.empty else 0
-            avg_losing_duration = losing_trades['duration_days'].mean() if not losing_trades.empty else 0
+            duration = trades['duration_days'].to_numpy(dtype=np.float64)
+            avg_duration = duration.mean()
+            avg_winning_duration = duration[win_mask].mean() if len(wins) else 0
+            avg_losing_duration = duration[loss_mask].mean() if len(losses) else 0
         else:
             avg_duration = avg_winning_duration = avg_losing_duration = 0
         
         # Risk Metrics
-        total_pnl = trades['realized_pnl'].sum()
-        std_dev = trades['realized_pnl'].std()
+        total_pnl = pnl.sum()
+        std_dev = pnl.std(ddof=1) if num_trades > 1 else np.nan
         sharpe_ratio = (avg_trade / std_dev) * np.sqrt(252) if std_dev > 0 else 0
         
         return {
-            'total_trades': len(trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'total_trades': num_trades,
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
             'win_rate': win_rate,
             'profit_factor': profit_factor,
             'avg_win': avg_win,
@@ -187,22 +198,23 @@ class PerformanceMetrics:
         
     def _calculate_drawdown_metrics(self, equity_curve: pd.DataFrame) -> Dict:
         """Calculate drawdown related metrics"""
-        equity = equity_curve['Equity']
-        peak = equity.expanding().max()
+        equity = equity_curve['Equity'].to_numpy(dtype=np.float64)
+        peak = np.maximum.accumulate(equity)
         drawdown = ((peak - equity) / peak) * 100
         
         max_drawdown = drawdown.max()
         
-        # Calculate drawdown durations
+        # Calculate drawdown durations from run lengths of in-drawdown bars
         in_drawdown = drawdown > 0
-        drawdown_periods = in_drawdown.astype(int).groupby((~in_drawdown).cumsum()).cumsum()
-        max_drawdown_duration = drawdown_periods.max()
+        edges = np.diff(np.concatenate(([0], in_drawdown.view(np.int8), [0])))
+        durations = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        max_drawdown_duration = durations.max() if len(durations) else 0
         
         # Average drawdown
         avg_drawdown = drawdown[in_drawdown].mean() if in_drawdown.any() else 0
         
         # Recovery factor
-        recovery_factor = equity_curve['Equity'].iloc[-1] / max_drawdown if max_drawdown > 0 else 0
+        recovery_factor = equity[-1] / max_drawdown if max_drawdown > 0 else 0
         
         return {
             'max_drawdown': max_drawdown,
@@ -216,7 +228,17 @@ class PerformanceMetrics:
         if equity_curve.empty:
             return {'avg_monthly_return': 0, 'best_month': 0, 'worst_month': 0}
         
-        monthly_returns = equity_curve['equity'].resample('M').last().pct_change().dropna()
+        # Month-end equity: last bar of each calendar month (local dates)
+        dates = pd.DatetimeIndex(equity_curve.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        months = dates.values.astype('datetime64[M]')
+        month_ends = np.flatnonzero(np.append(months[1:] != months[:-1], True))
+        month_end_equity = equity_curve['equity'].to_numpy(dtype=np.float64)[month_ends]
+        
+        monthly_returns = np.diff(month_end_equity) / month_end_equity[:-1]
+        if len(monthly_returns) == 0:
+            return {'avg_monthly_return': 0, 'best_month': 0, 'worst_month': 0}
         
         return {
             'avg_monthly_return': monthly_returns.mean() * 100,
@@ -229,7 +251,7 @@ class PerformanceMetrics:
         if trades.empty:
             return {}
             
-        pnl = trades['realized_pnl']
+        pnl = trades['realized_pnl'].astype(PNL_DTYPE)
         
         # Percentiles
         percentiles = {
@@ -256,20 +278,24 @@ class PerformanceMetrics:
             'kurtosis': pnl.kurtosis()
         }
         
+    def _pos_neg_pnl(self, trades: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Extract realized P&L once with its winning/losing masks"""
+        pnl = trades['realized_pnl'].to_numpy(dtype=PNL_DTYPE)
+        return pnl, pnl > 0, pnl < 0
+        
     def _calculate_expectancy(self, trades: pd.DataFrame) -> float:
         """Calculate expectancy per trade"""
         if trades.empty:
             return 0
             
-        winning_trades = trades[trades['PnL'] > 0]
-        losing_trades = trades[trades['PnL'] < 0]
+        pnl, win_mask, loss_mask = self._pos_neg_pnl(trades)
         
-        if len(winning_trades) == 0 or len(losing_trades) == 0:
+        if not win_mask.any() or not loss_mask.any():
             return 0
             
-        avg_win = winning_trades['realized_pnl'].mean()
-        avg_loss = abs(losing_trades['realized_pnl'].mean())
-        win_rate = len(winning_trades) / len(trades)
+        avg_win = pnl[win_mask].mean()
+        avg_loss = abs(pnl[loss_mask].mean())
+        win_rate = win_mask.mean()
         
         expectancy = (avg_win * win_rate) - (avg_loss * (1 - win_rate))
         return expectancy
@@ -280,14 +306,13 @@ class PerformanceMetrics:
             return 0
             
         # Simple risk of ruin calculation
-        winning_trades = trades[trades['PnL'] > 0]
-        losing_trades = trades[trades['PnL'] < 0]
+        pnl, win_mask, loss_mask = self._pos_neg_pnl(trades)
         
-        if len(losing_trades) == 0:
+        if not loss_mask.any():
             return 0
             
-        win_rate = len(winning_trades) / len(trades)
-        avg_loss = abs(losing_trades['PnL'].mean())
+        win_rate = win_mask.mean()
+        avg_loss = abs(pnl[loss_mask].mean())
         
         # Risk of losing 50% of capital
         max_acceptable_loss = initial_capital * 0.5
@@ -1,8 +1,71 @@
-import pandas as pd
+import tempfile
 import numpy as np
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+from datetime import timezone
 from .. import config
+from .simulation import position_size_kernel, sltp_scan, EXIT_REASONS, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Trade log action codes
+ACTION_BUY = 0
+ACTION_SELL = 1
+ACTION_NAMES = np.array(['BUY', 'SELL'], dtype=object)
+
+# Trade log exit reason codes (SL/TP match the simulation kernel's exit codes)
+REASON_NONE = -1  # BUY rows
+REASON_MANUAL = 0
+REASON_STOP_LOSS = EXIT_STOP_LOSS
+REASON_TAKE_PROFIT = EXIT_TAKE_PROFIT
+REASON_SIGNAL = 3
+REASON_CODES = {
+    'MANUAL': REASON_MANUAL,
+    'STOP_LOSS': REASON_STOP_LOSS,
+    'TAKE_PROFIT': REASON_TAKE_PROFIT,
+    'SIGNAL': REASON_SIGNAL
+}
+# Indexed by code; REASON_NONE (-1) picks the trailing None
+REASON_NAMES = np.array(['MANUAL', 'STOP_LOSS', 'TAKE_PROFIT', 'SIGNAL', None], dtype=object)
+
+# Trade log columns (SELL-only fields are NaN/None on BUY rows)
+TRADE_LOG_DTYPES = {
+    'action': np.int8,
+    'ticker': object,
+    'shares': np.int64,
+    'price': np.float64,
+    'value': np.float64,
+    'commission': np.float64,
+    'pnl': np.float64,
+    'pnl_pct': np.float64,
+    'reason': np.int8,
+    'time': np.int64,  # epoch ns, converted in trade_log
+    'cash_before': np.float64,
+    'cash_after': np.float64
+}
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+
+def _to_datetime64(value) -> np.datetime64:
+    """Bar timestamp as naive UTC datetime64[ns], the same value pandas would store"""
+    if isinstance(value, np.integer):
+        value = int(value)  # epoch ns
+    elif getattr(value, 'tzinfo', None) is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'ns')
+
+
+def _to_epoch_ns(value) -> int:
+    """Bar timestamp (datetime, datetime64 or epoch ns) as int64 epoch nanoseconds"""
+    return int(_to_datetime64(value).astype(np.int64))
+
+
+def _pandas():
+    """pandas, imported on first use so the portfolio itself doesn't need it"""
+    import pandas
+    return pandas
 
 
 class Portfolio:
@@ -11,20 +74,40 @@ class Portfolio:
     Handles position sizing, risk management, and exposure limits
     """
     
-    def __init__(self, initial_cash: float = 100000000):
+    __slots__ = (
+        'initial_cash', 'cash', 'positions', 'equity', '_total_exposure', '_unrealized_pnl',
+        'total_trades', 'winning_trades', 'losing_trades', 'total_pnl', 'commission_paid',
+        '_tl_n', '_tl',
+        '_n', '_equity_buf', '_cash_buf', '_positions_buf', '_time_buf',
+        '_row_tickers', '_ticker_rows', '_pos_arrays', '_spill_threshold',
+        '_commission_rate', '_risk_per_trade', '_max_position_exposure', '_max_total_exposure',
+        '_max_volume_participation', '_max_concurrent_positions'
+    )
+    
+    def __init__(self, initial_cash: float = 100000000, spill_threshold: int = 10_000_000):
         """
         Initialize portfolio
         
         Args:
             initial_cash: Starting capital in IDR
+            spill_threshold: Buffer length (entries) beyond which the equity
+                curve and numeric trade log columns move to disk-backed memmaps
         """
         self.initial_cash = initial_cash
+        self._spill_threshold = spill_threshold
+        
+        # Risk settings, read from config once per portfolio
+        self._commission_rate = config.COMMISSION_RATE
+        self._risk_per_trade = config.RISK_PER_TRADE
+        self._max_position_exposure = config.MAX_POSITION_EXPOSURE
+        self._max_total_exposure = config.MAX_TOTAL_EXPOSURE
+        self._max_volume_participation = config.MAX_VOLUME_PARTICIPATION
+        self._max_concurrent_positions = config.MAX_CONCURRENT_POSITIONS
         self.cash = initial_cash
         self.positions = {}  # {ticker: position_data}
+        self._total_exposure = 0.0  # Sum of open positions' entry values
+        self._unrealized_pnl = 0.0  # Sum of open positions' unrealized P&L
         self.equity = initial_cash
-        self.peak_equity = initial_cash
-        self.drawdown = 0
-        self.max_drawdown = 0
         
         # Trading statistics
         self.total_trades = 0
@@ -33,9 +116,30 @@ class Portfolio:
         self.total_pnl = 0
         self.commission_paid = 0
         
-        # Position tracking
-        self.trade_log = []
-        self.equity_curve = []
+        # Trade log as parallel column buffers (see the trade_log property)
+        self._tl_n = 0
+        self._tl = {column: np.empty(256, dtype=dtype) for column, dtype in TRADE_LOG_DTYPES.items()}
+        
+        # Equity curve buffers (one slot per update_positions call); peak and
+        # drawdown are derived from these when queried
+        self._n = 0
+        self._equity_buf = np.empty(256, dtype=np.float64)
+        self._cash_buf = np.empty(256, dtype=np.float64)
+        self._positions_buf = np.empty(256, dtype=np.int32)
+        self._time_buf = np.empty(256, dtype='datetime64[ns]')
+        
+        # Open positions mirrored as parallel arrays (one row per position)
+        # so update_positions can mark prices and scan SL/TP in one pass
+        self._row_tickers = []  # row -> ticker
+        self._ticker_rows = {}  # ticker -> row
+        self._pos_arrays = {
+            'entry': np.empty(8, dtype=np.float64),
+            'shares': np.empty(8, dtype=np.float64),
+            'sl': np.empty(8, dtype=np.float64),
+            'tp': np.empty(8, dtype=np.float64),
+            'cur': np.empty(8, dtype=np.float64),
+            'entry_ns': np.empty(8, dtype=np.int64)
+        }
         
     def calculate_position_size(self, 
                                ticker: str,
@@ -54,38 +158,11 @@ class Portfolio:
         Returns:
             Position size in shares
         """
-        # Risk per trade (1% of equity by default)
-        risk_amount = self.equity * config.RISK_PER_TRADE
-        
-        # Calculate stop distance
-        stop_distance = entry_price - stop_loss
-        if stop_distance <= 0:
-            return 0
-            
-        # Base position size from risk
-        position_value = risk_amount / stop_distance * entry_price
-        
-        # Apply maximum exposure limits
-        max_position_value = self.equity * config.MAX_POSITION_EXPOSURE
-        position_value = min(position_value, max_position_value)
-        
-        # Apply liquidity constraints (max 5% of daily volume)
-        if volatility:
-            max_liquidity_value = volatility * config.MAX_VOLUME_PARTICIPATION * entry_price
-            position_value = min(position_value, max_liquidity_value)
-        
-        # Calculate number of shares
-        shares = position_value / entry_price
-        
-        # Round to nearest lot (IDX lot size = 100 shares)
-        shares = int(shares / 100) * 100
-        
-        # Ensure we have enough cash
-        required_cash = shares * entry_price * (1 + config.COMMISSION_RATE)
-        if required_cash > self.cash:
-            shares = int(self.cash / (entry_price * (1 + config.COMMISSION_RATE)) / 100) * 100
-            
-        return shares
+        return int(position_size_kernel(
+            float(self.equity), float(entry_price), float(stop_loss), float(volatility or 0),
+            float(self.cash), self._risk_per_trade, self._max_position_exposure,
+            self._max_volume_participation, self._commission_rate
+        ))
         
     def can_open_position(self, ticker: str, position_value: float) -> bool:
         """
@@ -99,12 +176,12 @@ class Portfolio:
             True if position can be opened
         """
         # Check cash availability
-        required_cash = position_value * (1 + config.COMMISSION_RATE)
+        required_cash = position_value * (1 + self._commission_rate)
         if required_cash > self.cash:
             return False
             
         # Check maximum concurrent positions
-        if len(self.positions) >= config.MAX_CONCURRENT_POSITIONS:
+        if len(self.positions) >= self._max_concurrent_positions:
             return False
             
         # Check if we already have position in this ticker
@@ -112,8 +189,7 @@ class Portfolio:
             return False
             
         # Check total exposure
-        total_exposure = sum(pos['value'] for pos in self.positions.values())
-        if total_exposure + position_value > self.equity * config.MAX_TOTAL_EXPOSURE:
+        if self._total_exposure + position_value > self.equity * self._max_total_exposure:
             return False
             
         return True
@@ -123,8 +199,8 @@ class Portfolio:
                      shares: int,
                      entry_price: float,
                      stop_loss: float,
-                     take_profit: float = None,
-                     entry_time = None) -> Dict:
+                     take_profit: Optional[float],
+                     entry_time) -> Dict:
         """
         Open a new position
         
@@ -133,18 +209,20 @@ class Portfolio:
             shares: Number of shares
             entry_price: Entry price
             stop_loss: Stop loss price
-            take_profit: Take profit price
-            entry_time: Entry timestamp
+            take_profit: Take profit price (None for no target)
+            entry_time: Entry bar timestamp (datetime, datetime64 or epoch ns)
             
         Returns:
             Position data dictionary
         """
         position_value = shares * entry_price
-        commission = position_value * config.COMMISSION_RATE
+        commission = position_value * self._commission_rate
+        entry_ns = _to_epoch_ns(entry_time)
         
         # Update cash
         self.cash -= (position_value + commission)
         self.commission_paid += commission
+        self._total_exposure += position_value
         
         # Create position record
         position = {
@@ -152,7 +230,7 @@ class Portfolio:
             'shares': shares,
             'entry_price': entry_price,
             'entry_value': position_value,
-            'entry_time': entry_time or datetime.now(),
+            'entry_time': entry_time,
             'stop_loss': stop_loss,
             'take_profit': take_profit,
             'commission': commission,
@@ -164,27 +242,22 @@ class Portfolio:
         
         # Add to positions
         self.positions[ticker] = position
+        self._add_position_row(ticker, shares, entry_price, stop_loss, take_profit, entry_ns)
         
         # Record trade
         self.total_trades += 1
-        self.trade_log.append({
-            'action': 'BUY',
-            'ticker': ticker,
-            'shares': shares,
-            'price': entry_price,
-            'value': position_value,
-            'commission': commission,
-            'time': entry_time or datetime.now(),
-            'cash_before': self.cash + position_value + commission,
-            'cash_after': self.cash
-        })
+        self._append_trade(
+            ACTION_BUY, ticker, shares, entry_price, position_value, commission,
+            np.nan, np.nan, REASON_NONE, entry_ns,
+            self.cash + position_value + commission, self.cash
+        )
         
         return position
         
     def close_position(self, 
                        ticker: str,
                        exit_price: float,
-                       exit_time = None,
+                       exit_time,
                        exit_reason: str = 'MANUAL') -> Optional[Dict]:
         """
         Close an existing position
@@ -192,22 +265,25 @@ class Portfolio:
         Args:
             ticker: Stock ticker
             exit_price: Exit price
-            exit_time: Exit timestamp
-            exit_reason: Reason for exit (SL, TP, SIGNAL, MANUAL)
+            exit_time: Exit bar timestamp (datetime, datetime64 or epoch ns)
+            exit_reason: Reason for exit (STOP_LOSS, TAKE_PROFIT, SIGNAL, MANUAL)
             
         Returns:
             Closed position data or None if position not found
         """
         if ticker not in self.positions:
             return None
+        if exit_reason not in REASON_CODES:
+            raise ValueError(f"Unknown exit reason: {exit_reason}")
             
+        self._sync_position(ticker)
         position = self.positions[ticker]
         shares = position['shares']
         entry_value = position['entry_value']
         
         # Calculate exit values
         exit_value = shares * exit_price
-        commission = exit_value * config.COMMISSION_RATE
+        commission = exit_value * self._commission_rate
         net_exit_value = exit_value - commission
         
         # Calculate P&L
@@ -229,92 +305,212 @@ class Portfolio:
         # Update position record
         position['exit_price'] = exit_price
         position['exit_value'] = exit_value
-        position['exit_time'] = exit_time or datetime.now()
+        position['exit_time'] = exit_time
         position['exit_reason'] = exit_reason
         position['realized_pnl'] = net_pnl
-        position['duration_days'] = (position['exit_time'] - position['entry_time']).days
+        exit_ns = _to_epoch_ns(exit_time)
+        entry_ns = int(self._pos_arrays['entry_ns'][self._ticker_rows[ticker]])
+        position['duration_days'] = (exit_ns - entry_ns) // NS_PER_DAY
         
         # Record trade
-        self.trade_log.append({
-            'action': 'SELL',
-            'ticker': ticker,
-            'shares': shares,
-            'price': exit_price,
-            'value': exit_value,
-            'commission': commission,
-            'pnl': net_pnl,
-            'pnl_pct': pnl_pct,
-            'reason': exit_reason,
-            'time': exit_time or datetime.now(),
-            'cash_before': self.cash - net_exit_value,
-            'cash_after': self.cash
-        })
+        self._append_trade(
+            ACTION_SELL, ticker, shares, exit_price, exit_value, commission,
+            net_pnl, pnl_pct, REASON_CODES[exit_reason], exit_ns,
+            self.cash - net_exit_value, self.cash
+        )
         
         # Remove from positions
+        self._total_exposure -= entry_value
+        self._unrealized_pnl -= position['unrealized_pnl']
         del self.positions[ticker]
+        self._remove_position_row(ticker)
+        if not self.positions:
+            # Reset the running sums exactly so rounding can't accumulate
+            self._total_exposure = 0.0
+            self._unrealized_pnl = 0.0
         
         return position
         
-    def update_positions(self, current_prices: Dict[str, float], current_time = None):
+    def update_positions(self, current_prices: Dict[str, float], current_time):
         """
         Update all positions with current prices and calculate unrealized P&L
         
+        Only the positions priced in this call are re-marked and checked
+        against SL/TP, as array operations; equity comes from running sums of
+        entry value and unrealized P&L. The position dicts' current_price/
+        unrealized_pnl are refreshed lazily (on close and in get_portfolio_summary).
+        
         Args:
             current_prices: Dictionary of current prices by ticker
-            current_time: Current timestamp
+            current_time: Bar timestamp (datetime, datetime64 or epoch ns)
         """
-        total_unrealized_pnl = 0
-        
-        for ticker, position in self.positions.items():
-            if ticker in current_prices:
-                old_price = position['current_price']
-                new_price = current_prices[ticker]
-                position['current_price'] = new_price
-                
-                # Calculate unrealized P&L
-                unrealized_pnl = (new_price - position['entry_price']) * position['shares']
-                position['unrealized_pnl'] = unrealized_pnl
-                total_unrealized_pnl += unrealized_pnl
-                
-                # Check for stop loss or take profit
-                if new_price <= position['stop_loss']:
-                    self.close_position(ticker, new_price, current_time, 'STOP_LOSS')
-                elif position['take_profit'] and new_price >= position['take_profit']:
-                    self.close_position(ticker, new_price, current_time, 'TAKE_PROFIT')
-        
-        # Update equity
-        self.equity = self.cash + sum(pos['entry_value'] + pos['unrealized_pnl'] for pos in self.positions.values())
-        
-        # Update drawdown tracking
-        if self.equity > self.peak_equity:
-            self.peak_equity = self.equity
-            self.drawdown = 0
-        else:
-            self.drawdown = (self.peak_equity - self.equity) / self.peak_equity * 100
-            self.max_drawdown = max(self.max_drawdown, self.drawdown)
+        arrays = self._pos_arrays
+        
+        # Only positions with a new price can change value or hit SL/TP
+        tickers = [ticker for ticker in current_prices if ticker in self._ticker_rows]
+        if tickers:
+            rows = np.array([self._ticker_rows[ticker] for ticker in tickers], dtype=np.intp)
+            prices = np.array([current_prices[ticker] for ticker in tickers], dtype=np.float64)
+            shares = arrays['shares'][rows]
+            self._unrealized_pnl += float(((prices - arrays['cur'][rows]) * shares).sum())
+            arrays['cur'][rows] = prices
             
+            # Check for stop loss or take profit (JIT-compiled when numba is installed)
+            _, close_mask, exit_reason = sltp_scan(
+                prices, arrays['entry'][rows], shares, arrays['sl'][rows], arrays['tp'][rows]
+            )
+            for i in np.flatnonzero(close_mask):
+                self.close_position(tickers[i], current_prices[tickers[i]], current_time, EXIT_REASONS[exit_reason[i]])
+        
+        # Update equity (entry value + unrealized P&L of open positions)
+        self.equity = self.cash + self._total_exposure + self._unrealized_pnl
+        
         # Record equity curve
-        self.equity_curve.append({
-            'time': current_time or datetime.now(),
-            'equity': self.equity,
-            'cash': self.cash,
-            'positions': len(self.positions),
-            'drawdown': self.drawdown
-        })
+        n = self._n
+        if n == len(self._equity_buf):
+            self._equity_buf = self._grow(self._equity_buf, 2 * n)
+            self._cash_buf = self._grow(self._cash_buf, 2 * n)
+            self._positions_buf = self._grow(self._positions_buf, 2 * n)
+            self._time_buf = self._grow(self._time_buf, 2 * n)
+        self._equity_buf[n] = self.equity
+        self._cash_buf[n] = self.cash
+        self._positions_buf[n] = len(self.positions)
+        self._time_buf[n] = _to_datetime64(current_time)
+        self._n = n + 1
+        
+    def _grow(self, buf: np.ndarray, size: int) -> np.ndarray:
+        """
+        Resize a buffer to size entries, keeping its contents
+        
+        Past spill_threshold entries, numeric buffers are backed by an
+        anonymous temp file (np.memmap) instead of RAM so very long runs
+        don't run out of memory. Object columns always stay in memory.
+        """
+        if size <= self._spill_threshold or buf.dtype == object:
+            return np.resize(buf, size)
+        grown = np.memmap(tempfile.TemporaryFile(), dtype=buf.dtype, mode='w+', shape=(size,))
+        grown[:len(buf)] = buf
+        return grown
+        
+    def _drawdown_series(self) -> np.ndarray:
+        """Drawdown (%) at each recorded update, measured from the running peak"""
+        equity = self._equity_buf[:self._n]
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_cash))
+        return (peak - equity) / peak * 100
+        
+    @property
+    def peak_equity(self) -> float:
+        """Highest equity seen so far (never below the starting capital)"""
+        if self._n == 0:
+            return self.initial_cash
+        return max(self.initial_cash, float(self._equity_buf[:self._n].max()))
+        
+    @property
+    def drawdown(self) -> float:
+        """Drawdown (%) as of the last update"""
+        return float(self._drawdown_series()[-1]) if self._n else 0
+        
+    @property
+    def max_drawdown(self) -> float:
+        """Largest drawdown (%) over all updates"""
+        return float(self._drawdown_series().max()) if self._n else 0
+        
+    @property
+    def equity_curve_df(self) -> 'pd.DataFrame':
+        """Equity curve as a DataFrame indexed by update time"""
+        pd = _pandas()
+        
+        n = self._n
+        return pd.DataFrame({
+            'equity': self._equity_buf[:n],
+            'cash': self._cash_buf[:n],
+            'positions': self._positions_buf[:n],
+            'drawdown': self._drawdown_series()
+        }, index=pd.DatetimeIndex(self._time_buf[:n], name='time'))
+        
+    def _append_trade(self, *values):
+        """Append one trade log row (values in TRADE_LOG_DTYPES order)"""
+        n = self._tl_n
+        columns = self._tl
+        if n == len(columns['action']):
+            for column, buf in columns.items():
+                columns[column] = self._grow(buf, 2 * n)
+        for buf, value in zip(columns.values(), values):
+            buf[n] = value
+        self._tl_n = n + 1
+        
+    @property
+    def trade_log(self) -> 'pd.DataFrame':
+        """Trade log (one row per BUY/SELL) materialized as a DataFrame"""
+        pd = _pandas()
+        
+        n = self._tl_n
+        log = pd.DataFrame({column: buf[:n] for column, buf in self._tl.items()})
+        log['action'] = ACTION_NAMES[log['action'].to_numpy()]
+        log['reason'] = REASON_NAMES[log['reason'].to_numpy()]
+        log['time'] = pd.to_datetime(log['time'], unit='ns')
+        return log
+        
+    def mark_position(self, ticker: str, current_price: float):
+        """Set a position's mark-to-market price without touching equity"""
+        row = self._ticker_rows[ticker]
+        arrays = self._pos_arrays
+        self._unrealized_pnl += float((current_price - arrays['cur'][row]) * arrays['shares'][row])
+        arrays['cur'][row] = current_price
+        
+    def _add_position_row(self, ticker: str, shares: int, entry_price: float,
+                          stop_loss: float, take_profit: Optional[float], entry_ns: int):
+        """Append an open position to the parallel arrays, growing them if full"""
+        row = len(self._row_tickers)
+        arrays = self._pos_arrays
+        if row == len(arrays['entry']):
+            for key, values in arrays.items():
+                arrays[key] = np.resize(values, 2 * len(values))
+        arrays['entry'][row] = entry_price
+        arrays['shares'][row] = shares
+        arrays['sl'][row] = stop_loss
+        arrays['tp'][row] = take_profit or 0.0
+        arrays['cur'][row] = entry_price
+        arrays['entry_ns'][row] = entry_ns
+        self._row_tickers.append(ticker)
+        self._ticker_rows[ticker] = row
+        
+    def _remove_position_row(self, ticker: str):
+        """Remove a position's row by moving the last row into its slot"""
+        row = self._ticker_rows.pop(ticker)
+        last = len(self._row_tickers) - 1
+        if row != last:
+            last_ticker = self._row_tickers[last]
+            for values in self._pos_arrays.values():
+                values[row] = values[last]
+            self._row_tickers[row] = last_ticker
+            self._ticker_rows[last_ticker] = row
+        self._row_tickers.pop()
+        
+    def _sync_position(self, ticker: str):
+        """Copy the latest mark from the arrays into the position dict"""
+        row = self._ticker_rows[ticker]
+        position = self.positions[ticker]
+        current_price = float(self._pos_arrays['cur'][row])
+        position['current_price'] = current_price
+        position['unrealized_pnl'] = (current_price - position['entry_price']) * position['shares']
         
     def get_portfolio_summary(self) -> Dict:
         """Get comprehensive portfolio summary"""
+        for ticker in self.positions:
+            self._sync_position(ticker)
+            
         win_rate = (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0
         avg_win = 0
         avg_loss = 0
         
         # Calculate average win/loss from trade log
-        sells = [trade for trade in self.trade_log if trade['action'] == 'SELL']
-        if sells:
-            wins = [trade['pnl'] for trade in sells if trade['pnl'] > 0]
-            losses = [trade['pnl'] for trade in sells if trade['pnl'] < 0]
-            avg_win = np.mean(wins) if wins else 0
-            avg_loss = np.mean(losses) if losses else 0
+        n = self._tl_n
+        sells = self._tl['pnl'][:n][self._tl['action'][:n] == ACTION_SELL]
+        wins = sells[sells > 0]
+        losses = sells[sells < 0]
+        avg_win = wins.mean() if len(wins) else 0
+        avg_loss = losses.mean() if len(losses) else 0
         
         profit_factor = abs(avg_win * self.winning_trades / (avg_loss * self.losing_trades)) if avg_loss != 0 and self.losing_trades > 0 else 0
         
@@ -1,29 +1,139 @@
+import sys
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-from tabulate import tabulate
 from colorama import Fore, Style
 
 from .metrics import PerformanceMetrics
 
 
+class _NoColor:
+    """Stand-in for colorama's Fore/Style that renders every code as ''"""
+    
+    def __getattr__(self, name: str) -> str:
+        return ''
+
+
+NO_COLOR = _NoColor()
+
+
+def _build_templates(fore, style) -> Dict[str, str]:
+    """
+    Build the report templates with ANSI codes baked in
+    
+    Args:
+        fore: colorama Fore (or NO_COLOR)
+        style: colorama Style (or NO_COLOR)
+        
+    Returns:
+        Templates by name, filled later with str.format_map
+    """
+    bright = style.BRIGHT
+    reset = style.RESET_ALL
+    return {
+        'summary': f"""
+{bright}{fore.CYAN}╔══════════════════════════════════════════════════════════════════════╗
+║                    SWING TRADING BACKTEST REPORT                          ║
+╚════════════════════════════════════════════════════════════════════════╝{reset}
+
+{bright}Test Period:{reset}        {{period}}
+{bright}Initial Capital:{reset}    {{initial_capital}}
+{bright}Total Tickers:{reset}       {{total_tickers}} ({{successful_tickers}} profitable)
+
+{bright}{fore.GREEN}PERFORMANCE METRICS:{reset}
+├─ Total Trades:           {{total_trades}}
+├─ Average Return:          {{avg_return:.2f}}%
+├─ Win Rate:                {{avg_win_rate:.1f}}%
+├─ Profit Factor:           {{avg_profit_factor:.2f}}
+├─ Max Drawdown:            {{max_drawdown:.2f}}%
+└─ Sharpe Ratio:            {{avg_sharpe:.2f}}
+
+{bright}{fore.YELLOW}STRATEGY ASSESSMENT:{reset}
+├─ Overall Rating:          {{rating}}
+├─ Strengths:               {{strengths}}
+└─ Areas for Improvement:    {{weaknesses}}
+""",
+        'top_performers_header': f"\n{bright}{fore.BLUE}TOP PERFORMERS:{reset}\n",
+        'footer': f"""
+{bright}{fore.MAGENTA}╔══════════════════════════════════════════════════════════════════════╗
+║                           END OF REPORT                                 ║
+╚════════════════════════════════════════════════════════════════════════╝{reset}
+""",
+        'detailed': f"""
+{bright}{fore.CYAN}╔══════════════════════════════════════════════════════════════════════╗
+║                    DETAILED ANALYSIS: {{ticker:<10}}                          ║
+╚════════════════════════════════════════════════════════════════════════╝{reset}
+
+{bright}TRADE STATISTICS:{reset}
+├─ Total Trades:           {{total_trades}}
+├─ Winning Trades:         {{winning_trades}}
+├─ Losing Trades:           {{losing_trades}}
+├─ Win Rate:                {{win_rate:.1f}}%
+├─ Profit Factor:           {{profit_factor:.2f}}
+├─ Average Win:             {{avg_win}}
+├─ Average Loss:            {{avg_loss}}
+└─ Expectancy:              {{expectancy}}
+
+{bright}RISK METRICS:{reset}
+├─ Total Return:            {{total_return:.2f}}%
+├─ Max Drawdown:            {{max_drawdown:.2f}}%
+├─ Sharpe Ratio:            {{sharpe_ratio:.2f}}
+└─ Risk of Ruin:            {{risk_of_ruin:.2f}}%
+
+{bright}SWING TRADING METRICS:{reset}
+""",
+        'recent_trades_header': f"\n{bright}{fore.YELLOW}RECENT TRADES (Last 10):{reset}\n"
+    }
+
+
+# Templates for colored (terminal) and plain (redirected/CI) output, built once
+TEMPLATES = {True: _build_templates(Fore, Style), False: _build_templates(NO_COLOR, NO_COLOR)}
+
+TOP_PERFORMER_LINE = "├─ {:<10} Win Rate: {:.1f}%, PF: {:.2f}, Trades: {}\n"
+
+SWING_METRICS_TEMPLATE = """├─ Avg Holding Period:      {mean_holding:.1f} days
+├─ Target Achievement:      {target_holding_achievement:.1f}%
+├─ Quick Trades Win Rate:  {quick_trades_win_rate:.1f}%
+└─ Long Trades Win Rate:   {long_trades_win_rate:.1f}%
+"""
+
+# Columns shown by _format_trades_table and the value used when one is missing
+TRADES_TABLE_DEFAULTS = {
+    'EntryTime': '',
+    'ExitTime': '',
+    'EntryPrice': 0,
+    'ExitPrice': 0,
+    'PnL': 0,
+    'PnL%': 0
+}
+
+# (divisor, format) per magnitude tier, matching _format_currency
+CURRENCY_TIERS = ((1e9, '%.1fB IDR'), (1e6, '%.1fM IDR'), (1e3, '%.0fK IDR'), (1, '%.0f IDR'))
+
+
 class BacktestReport:
     """
     Generate comprehensive backtesting reports with visualizations
     """
     
-    def __init__(self, metrics_calculator: PerformanceMetrics = None):
+    def __init__(self, metrics_calculator: PerformanceMetrics = None, color: Optional[bool] = None):
         """
         Initialize report generator
         
         Args:
             metrics_calculator: PerformanceMetrics instance
+            color: Emit ANSI colors (default: only when stdout is a terminal)
         """
         self.metrics = metrics_calculator or PerformanceMetrics()
         
+        # Pick colored or plain output once instead of at every interpolation
+        if color is None:
+            color = sys.stdout is not None and sys.stdout.isatty()
+        self._F = Fore if color else NO_COLOR
+        self._S = Style if color else NO_COLOR
+        self._templates = TEMPLATES[bool(color)]
+        
     def generate_summary_report(self, backtest_results: Dict) -> str:
         """
         Generate comprehensive summary report
@@ -35,66 +145,42 @@ class BacktestReport:
             Formatted report string
         """
         if 'error' in backtest_results:
-            return f"{Fore.RED}Error: {backtest_results['error']}{Style.RESET_ALL}"
+            return f"{self._F.RED}Error: {backtest_results['error']}{self._S.RESET_ALL}"
             
         # Extract key metrics
-        period = backtest_results.get('period', 'Unknown')
-        initial_capital = backtest_results.get('initial_capital', 0)
-        total_trades = backtest_results.get('total_trades', 0)
-        avg_return = backtest_results.get('avg_return', 0)
         avg_win_rate = backtest_results.get('avg_win_rate', 0)
         avg_profit_factor = backtest_results.get('avg_profit_factor', 0)
         max_drawdown = backtest_results.get('max_drawdown', 0)
-        avg_sharpe = backtest_results.get('avg_sharpe_ratio', 0)
-        successful_tickers = backtest_results.get('successful_tickers', 0)
-        total_tickers = backtest_results.get('total_tickers', 0)
-        
-        # Format report
-        report = f"""
-{Style.BRIGHT}{Fore.CYAN}╔══════════════════════════════════════════════════════════════════════╗
-║                    SWING TRADING BACKTEST REPORT                          ║
-╚════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}
-
-{Style.BRIGHT}Test Period:{Style.RESET_ALL}        {period}
-{Style.BRIGHT}Initial Capital:{Style.RESET_ALL}    {self._format_currency(initial_capital)}
-{Style.BRIGHT}Total Tickers:{Style.RESET_ALL}       {total_tickers} ({successful_tickers} profitable)
-
-{Style.BRIGHT}{Fore.GREEN}PERFORMANCE METRICS:{Style.RESET_ALL}
-├─ Total Trades:           {total_trades}
-├─ Average Return:          {avg_return:.2f}%
-├─ Win Rate:                {avg_win_rate:.1f}%
-├─ Profit Factor:           {avg_profit_factor:.2f}
-├─ Max Drawdown:            {max_drawdown:.2f}%
-└─ Sharpe Ratio:            {avg_sharpe:.2f}
-
-{Style.BRIGHT}{Fore.YELLOW}STRATEGY ASSESSMENT:{Style.RESET_ALL}
-"""
         
         # Strategy assessment
         assessment = self._assess_strategy_performance(avg_win_rate, avg_profit_factor, max_drawdown)
-        report += f"├─ Overall Rating:          {assessment['rating']}\n"
-        report += f"├─ Strengths:               {', '.join(assessment['strengths'])}\n"
-        report += f"└─ Areas for Improvement:    {', '.join(assessment['weaknesses'])}\n"
+        
+        # Format report
+        report = self._templates['summary'].format_map({
+            'period': backtest_results.get('period', 'Unknown'),
+            'initial_capital': self._format_currency(backtest_results.get('initial_capital', 0)),
+            'total_tickers': backtest_results.get('total_tickers', 0),
+            'successful_tickers': backtest_results.get('successful_tickers', 0),
+            'total_trades': backtest_results.get('total_trades', 0),
+            'avg_return': backtest_results.get('avg_return', 0),
+            'avg_win_rate': avg_win_rate,
+            'avg_profit_factor': avg_profit_factor,
+            'max_drawdown': max_drawdown,
+            'avg_sharpe': backtest_results.get('avg_sharpe_ratio', 0),
+            'rating': assessment['rating'],
+            'strengths': ', '.join(assessment['strengths']),
+            'weaknesses': ', '.join(assessment['weaknesses'])
+        })
         
         # Individual ticker results
         ticker_results = backtest_results.get('ticker_results', {})
         if ticker_results:
-            report += f"\n{Style.BRIGHT}{Fore.BLUE}TOP PERFORMERS:{Style.RESET_ALL}\n"
-            top_performers = sorted(ticker_results.items(), 
-                                  key=lambda x: x[1].get('win_rate', 0), 
-                                  reverse=True)[:5]
-            
-            for ticker, result in top_performers:
-                win_rate = result.get('win_rate', 0)
-                profit_factor = result.get('profit_factor', 0)
-                trades = result.get('total_trades', 0)
-                report += f"├─ {ticker:<10} Win Rate: {win_rate:.1f}%, PF: {profit_factor:.2f}, Trades: {trades}\n"
+            top_performers = self._ticker_results_frame(ticker_results).nlargest(5, 'win_rate')
+            report += self._templates['top_performers_header'] + ''.join(
+                TOP_PERFORMER_LINE.format(*row) for row in top_performers.itertuples()
+            )
         
-        report += f"\n{Style.BRIGHT}{Fore.MAGENTA}╔══════════════════════════════════════════════════════════════════════╗\n"
-        report += f"║                           END OF REPORT                                 ║\n"
-        report += f"╚════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}\n"
-        
-        return report
+        return report + self._templates['footer']
         
     def generate_detailed_ticker_report(self, ticker: str, ticker_result: Dict) -> str:
         """
@@ -111,7 +197,7 @@ class BacktestReport:
         trades = ticker_result.get('trades', pd.DataFrame())
         
         if trades.empty:
-            return f"{Fore.RED}No trades found for {ticker}{Style.RESET_ALL}"
+            return f"{self._F.RED}No trades found for {ticker}{self._S.RESET_ALL}"
             
         # Calculate detailed metrics
         detailed_metrics = self.metrics.calculate_advanced_metrics(trades, 
@@ -120,40 +206,33 @@ class BacktestReport:
         
         swing_metrics = self.metrics.calculate_swing_trading_metrics(trades)
         
-        report = f"""
-{Style.BRIGHT}{Fore.CYAN}╔══════════════════════════════════════════════════════════════════════╗
-║                    DETAILED ANALYSIS: {ticker:<10}                          ║
-╚════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}
-
-{Style.BRIGHT}TRADE STATISTICS:{Style.RESET_ALL}
-├─ Total Trades:           {detailed_metrics.get('total_trades', 0)}
-├─ Winning Trades:         {detailed_metrics.get('winning_trades', 0)}
-├─ Losing Trades:           {detailed_metrics.get('losing_trades', 0)}
-├─ Win Rate:                {detailed_metrics.get('win_rate', 0):.1f}%
-├─ Profit Factor:           {detailed_metrics.get('profit_factor', 0):.2f}
-├─ Average Win:             {self._format_currency(detailed_metrics.get('avg_win', 0))}
-├─ Average Loss:            {self._format_currency(detailed_metrics.get('avg_loss', 0))}
-└─ Expectancy:              {self._format_currency(detailed_metrics.get('expectancy', 0))}
-
-{Style.BRIGHT}RISK METRICS:{Style.RESET_ALL}
-├─ Total Return:            {detailed_metrics.get('total_return', 0):.2f}%
-├─ Max Drawdown:            {detailed_metrics.get('max_drawdown', 0):.2f}%
-├─ Sharpe Ratio:            {detailed_metrics.get('sharpe_ratio', 0):.2f}
-└─ Risk of Ruin:            {detailed_metrics.get('risk_of_ruin', 0):.2f}%
-
-{Style.BRIGHT}SWING TRADING METRICS:{Style.RESET_ALL}
-"""
+        report = self._templates['detailed'].format_map({
+            'ticker': ticker,
+            'total_trades': detailed_metrics.get('total_trades', 0),
+            'winning_trades': detailed_metrics.get('winning_trades', 0),
+            'losing_trades': detailed_metrics.get('losing_trades', 0),
+            'win_rate': detailed_metrics.get('win_rate', 0),
+            'profit_factor': detailed_metrics.get('profit_factor', 0),
+            'avg_win': self._format_currency(detailed_metrics.get('avg_win', 0)),
+            'avg_loss': self._format_currency(detailed_metrics.get('avg_loss', 0)),
+            'expectancy': self._format_currency(detailed_metrics.get('expectancy', 0)),
+            'total_return': detailed_metrics.get('total_return', 0),
+            'max_drawdown': detailed_metrics.get('max_drawdown', 0),
+            'sharpe_ratio': detailed_metrics.get('sharpe_ratio', 0),
+            'risk_of_ruin': detailed_metrics.get('risk_of_ruin', 0)
+        })
         
         if swing_metrics:
-            holding_stats = swing_metrics.get('holding_period_stats', {})
-            report += f"├─ Avg Holding Period:      {holding_stats.get('mean', 0):.1f} days\n"
-            report += f"├─ Target Achievement:      {swing_metrics.get('target_holding_achievement', 0):.1f}%\n"
-            report += f"├─ Quick Trades Win Rate:  {swing_metrics.get('quick_trades_win_rate', 0):.1f}%\n"
-            report += f"└─ Long Trades Win Rate:   {swing_metrics.get('long_trades_win_rate', 0):.1f}%\n"
+            report += SWING_METRICS_TEMPLATE.format_map({
+                'mean_holding': swing_metrics.get('holding_period_stats', {}).get('mean', 0),
+                'target_holding_achievement': swing_metrics.get('target_holding_achievement', 0),
+                'quick_trades_win_rate': swing_metrics.get('quick_trades_win_rate', 0),
+                'long_trades_win_rate': swing_metrics.get('long_trades_win_rate', 0)
+            })
         
         # Recent trades
         if not trades.empty:
-            report += f"\n{Style.BRIGHT}{Fore.YELLOW}RECENT TRADES (Last 10):{Style.RESET_ALL}\n"
+            report += self._templates['recent_trades_header']
             recent_trades = trades.tail(10)[['EntryTime', 'ExitTime', 'EntryPrice', 'ExitPrice', 'PnL', 'PnL%']]
             report += self._format_trades_table(recent_trades)
         
@@ -170,17 +249,30 @@ class BacktestReport:
             Formatted trade log
         """
         if trades.empty:
-            return f"{Fore.YELLOW}No trades to display{Style.RESET_ALL}"
+            return f"{self._F.YELLOW}No trades to display{self._S.RESET_ALL}"
             
-        # Format trades for display
-        display_trades = trades.copy()
-        display_trades['EntryTime'] = pd.to_datetime(display_trades['EntryTime']).dt.strftime('%Y-%m-%d')
-        display_trades['ExitTime'] = pd.to_datetime(display_trades['ExitTime']).dt.strftime('%Y-%m-%d')
-        display_trades['PnL'] = display_trades['PnL'].apply(lambda x: f"{Fore.GREEN if x > 0 else Fore.RED}{self._format_currency(x)}{Style.RESET_ALL}")
-        display_trades['PnL%'] = display_trades['PnL%'].apply(lambda x: f"{Fore.GREEN if x > 0 else Fore.RED}{x:.2f}%{Style.RESET_ALL}")
+        # Pull the display columns out once and format them column-wise
+        entry_times = pd.to_datetime(trades['EntryTime']).dt.strftime('%Y-%m-%d').tolist()
+        exit_times = pd.to_datetime(trades['ExitTime']).dt.strftime('%Y-%m-%d').tolist()
+        pnl = trades['PnL'].to_numpy()
+        pnl_pct = trades['PnL%'].to_numpy()
+        pnl_text = self._format_currency_vec(pnl)
+        green, red, reset = self._F.GREEN, self._F.RED, self._S.RESET_ALL
+        pnl_colors = np.where(pnl > 0, green, red)
+        pct_colors = np.where(pnl_pct > 0, green, red)
+        
+        from tabulate import tabulate
         
         headers = ['Entry', 'Exit', 'Entry Price', 'Exit Price', 'P&L', 'P&L%']
-        table_data = display_trades[['EntryTime', 'ExitTime', 'EntryPrice', 'ExitPrice', 'PnL', 'PnL%']].values.tolist()
+        table_data = [
+            [entry_time, exit_time, entry_price, exit_price,
+             f"{pnl_color}{amount}{reset}",
+             f"{pct_color}{pct:.2f}%{reset}"]
+            for entry_time, exit_time, entry_price, exit_price, amount, pct, pnl_color, pct_color in zip(
+                entry_times, exit_times, trades['EntryPrice'].tolist(), trades['ExitPrice'].tolist(),
+                pnl_text, pnl_pct.tolist(), pnl_colors, pct_colors
+            )
+        ]
         
         return tabulate(table_data, headers=headers, tablefmt="fancy_grid")
         
@@ -193,17 +285,34 @@ class BacktestReport:
             save_path: Path to save charts (optional)
         """
         try:
-            # Set up the plotting style
-            plt.style.use('seaborn-v0_8')
-            fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+            # Imported here so text-only runs don't pay matplotlib's startup cost
+            import matplotlib.style
+            
+            # Set up the plotting style (bundled with matplotlib, no seaborn import needed)
+            matplotlib.style.use('seaborn-v0_8')
+            if save_path:
+                # A bare Figure renders with Agg and never touches pyplot's
+                # global state or a GUI backend, so it is safe off the main thread
+                from matplotlib.figure import Figure
+                fig = Figure(figsize=(15, 12))
+                axes = fig.subplots(2, 2)
+            else:
+                import matplotlib.pyplot as plt
+                fig, axes = plt.subplots(2, 2, figsize=(15, 12))
             fig.suptitle('Swing Trading Strategy Performance Analysis', fontsize=16, fontweight='bold')
             
-            # Chart 1: Win Rate Distribution
+            # Per-ticker metrics as arrays, pulled out once for all charts
             ticker_results = backtest_results.get('ticker_results', {})
             if ticker_results:
-                win_rates = [result.get('win_rate', 0) for result in ticker_results.values()]
-                axes[0, 0].hist(win_rates, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-                axes[0, 0].axvline(np.mean(win_rates), color='red', linestyle='--', label=f'Mean: {np.mean(win_rates):.1f}%')
+                results_df = self._ticker_results_frame(ticker_results)
+                all_win_rates = results_df['win_rate'].to_numpy()
+                all_profit_factors = results_df['profit_factor'].to_numpy()
+                trade_counts = results_df['total_trades'].to_numpy()
+            
+            # Chart 1: Win Rate Distribution
+            if ticker_results:
+                axes[0, 0].hist(all_win_rates, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
+                axes[0, 0].axvline(np.mean(all_win_rates), color='red', linestyle='--', label=f'Mean: {np.mean(all_win_rates):.1f}%')
                 axes[0, 0].set_title('Win Rate Distribution Across Tickers')
                 axes[0, 0].set_xlabel('Win Rate (%)')
                 axes[0, 0].set_ylabel('Number of Tickers')
@@ -212,17 +321,9 @@ class BacktestReport:
             
             # Chart 2: Profit Factor vs Win Rate Scatter
             if ticker_results:
-                win_rates = []
-                profit_factors = []
-                tickers = []
-                
-                for ticker, result in ticker_results.items():
-                    wr = result.get('win_rate', 0)
-                    pf = result.get('profit_factor', 0)
-                    if pf != float('inf') and pf < 10:  # Filter extreme values
-                        win_rates.append(wr)
-                        profit_factors.append(pf)
-                        tickers.append(ticker)
+                mask = np.isfinite(all_profit_factors) & (all_profit_factors < 10)  # Filter extreme values
+                win_rates = all_win_rates[mask]
+                profit_factors = all_profit_factors[mask]
                 
                 scatter = axes[0, 1].scatter(win_rates, profit_factors, alpha=0.6, s=50)
                 axes[0, 1].set_title('Profit Factor vs Win Rate')
@@ -238,7 +339,6 @@ class BacktestReport:
             
             # Chart 3: Trade Count Distribution
             if ticker_results:
-                trade_counts = [result.get('total_trades', 0) for result in ticker_results.values()]
                 axes[1, 0].hist(trade_counts, bins=20, alpha=0.7, color='lightgreen', edgecolor='black')
                 axes[1, 0].axvline(np.mean(trade_counts), color='red', linestyle='--', label=f'Mean: {np.mean(trade_counts):.1f}')
                 axes[1, 0].set_title('Number of Trades per Ticker')
@@ -278,11 +378,11 @@ STRATEGY ASSESSMENT:
             axes[1, 1].text(0.1, 0.9, summary_text, transform=axes[1, 1].transAxes,
                           fontsize=11, verticalalignment='top', fontfamily='monospace')
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Save or show
             if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                fig.savefig(save_path, dpi=300, bbox_inches='tight')
                 print(f"Charts saved to {save_path}")
             else:
                 plt.show()
@@ -290,6 +390,12 @@ STRATEGY ASSESSMENT:
         except Exception as e:
             print(f"Error creating charts: {e}")
             
+    def _ticker_results_frame(self, ticker_results: Dict) -> pd.DataFrame:
+        """Win rate, profit factor and trade count per ticker (missing values as 0)"""
+        results_df = pd.DataFrame.from_dict(ticker_results, orient='index')
+        results_df = results_df.reindex(columns=['win_rate', 'profit_factor', 'total_trades']).fillna(0)
+        return results_df.astype({'total_trades': np.int64})
+        
     def _assess_strategy_performance(self, win_rate: float, profit_factor: float, max_drawdown: float) -> Dict:
         """Assess overall strategy performance"""
         rating = "UNKNOWN"
@@ -363,23 +469,48 @@ STRATEGY ASSESSMENT:
         else:
             return f"{amount:.0f} IDR"
             
+    def _format_currency_vec(self, amounts: np.ndarray) -> np.ndarray:
+        """Format an array of currency amounts (vectorized _format_currency)"""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        magnitude = np.abs(amounts)
+        tiers = np.select([magnitude >= 1e9, magnitude >= 1e6, magnitude >= 1e3], [0, 1, 2], default=3)
+        
+        formatted = np.empty(len(amounts), dtype=object)
+        for tier, (divisor, fmt) in enumerate(CURRENCY_TIERS):
+            mask = tiers == tier
+            if mask.any():
+                formatted[mask] = np.char.mod(fmt, amounts[mask] / divisor)
+        return formatted
+        
     def _format_trades_table(self, trades: pd.DataFrame) -> str:
         """Format trades table for display"""
         if trades.empty:
             return "No trades to display"
             
+        # Display columns, with the old per-row defaults for any that are missing
+        missing = {column: default for column, default in TRADES_TABLE_DEFAULTS.items()
+                   if column not in trades.columns}
+        table = trades.reindex(columns=list(TRADES_TABLE_DEFAULTS)).assign(**missing)
+        
+        pnl = table['PnL'].to_numpy(dtype=np.float64)
+        pnl_pct = table['PnL%'].to_numpy(dtype=np.float64)
+        pnl_text = self._format_currency_vec(pnl)
+        green, red, reset = self._F.GREEN, self._F.RED, self._S.RESET_ALL
+        pnl_colors = np.where(pnl > 0, green, red)
+        pct_colors = np.where(pnl_pct > 0, green, red)
+        
         # Convert to list of lists for tabulate
-        table_data = []
-        for _, trade in trades.iterrows():
-            row = [
-                trade.get('EntryTime', ''),
-                trade.get('ExitTime', ''),
-                f"{trade.get('EntryPrice', 0):.0f}",
-                f"{trade.get('ExitPrice', 0):.0f}",
-                f"{Fore.GREEN if trade.get('PnL', 0) > 0 else Fore.RED}{self._format_currency(trade.get('PnL', 0))}{Style.RESET_ALL}",
-                f"{Fore.GREEN if trade.get('PnL%', 0) > 0 else Fore.RED}{trade.get('PnL%', 0):.2f}%{Style.RESET_ALL}"
-            ]
-            table_data.append(row)
+        table_data = [
+            [entry_time, exit_time, f"{entry_price:.0f}", f"{exit_price:.0f}",
+             f"{pnl_color}{amount}{reset}",
+             f"{pct_color}{pct:.2f}%{reset}"]
+            for (entry_time, exit_time, entry_price, exit_price), amount, pct, pnl_color, pct_color in zip(
+                table[['EntryTime', 'ExitTime', 'EntryPrice', 'ExitPrice']].itertuples(index=False, name=None),
+                pnl_text, pnl_pct.tolist(), pnl_colors, pct_colors
+            )
+        ]
+        
+        from tabulate import tabulate
         
         headers = ['Entry', 'Exit', 'Entry Price', 'Exit Price', 'P&L', 'P&L%']
         return tabulate(table_data, headers=headers, tablefmt="fancy_grid")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import numpy as np
+
+from ..jit import njit
+
+# Exit reason codes returned by simulate_trades
+EXIT_OPEN = 0
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+
+EXIT_REASONS = {
+    EXIT_STOP_LOSS: 'STOP_LOSS',
+    EXIT_TAKE_PROFIT: 'TAKE_PROFIT',
+}
+
+
+@njit(cache=True)
+def simulate_trades(closes, entry_signals, stop_losses, take_profits,
+                    start, initial_cash, position_value, commission_rate):
+    """
+    Single-position simulation over precomputed indicator arrays
+
+    Jumps from entry to exit: after an entry at bar e the exit bar is the
+    first bar >= e whose close hits the stop loss or take profit, found with
+    one vectorized scan instead of stepping through every bar. Mirrors the
+    cash bookkeeping of Portfolio.open_position/close_position so the caller
+    can replay the returned trades through a Portfolio.
+
+    Args:
+        closes: Close prices (float64)
+        entry_signals: Bars where a filtered entry setup fired (bool)
+        stop_losses: Stop loss level per bar (float64)
+        take_profits: Take profit level per bar (float64)
+        start: First bar to simulate (warmup bars are skipped)
+        initial_cash: Starting capital in IDR
+        position_value: Target value per position in IDR
+        commission_rate: Commission rate per side
+
+    Returns:
+        Tuple of (entry_idx, exit_idx, shares, exit_reason, equity) where the
+        first four are per-trade arrays (exit_idx is -1 for a trade still open
+        at the end) and equity is the per-bar equity curve.
+    """
+    n = len(closes)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    trade_shares = np.empty(n, dtype=np.int64)
+    exit_reason = np.empty(n, dtype=np.int8)
+    equity = np.empty(n, dtype=np.float64)
+
+    cash = initial_cash
+    next_bar = start  # first bar not yet written to equity / eligible for entry
+    count = 0
+
+    for e in np.flatnonzero(entry_signals[start:]) + start:
+        if e < next_bar:
+            continue
+
+        # Entry: round to lots and check we can afford it
+        price = closes[e]
+        shares = int(position_value / price / 100) * 100
+        cost = shares * price * (1 + commission_rate)
+        if cost > cash:
+            continue
+
+        equity[next_bar:e] = cash
+        entry_value = shares * price
+        cash -= (entry_value + entry_value * commission_rate)
+        stop_loss = stop_losses[e]
+        take_profit = take_profits[e]
+        entry_idx[count] = e
+        trade_shares[count] = shares
+        count += 1
+
+        # Exit: first close at or beyond the stop loss / take profit
+        window = closes[e:]
+        hits = (window <= stop_loss) | (window >= take_profit)
+        if not hits.any():
+            equity[e:] = cash + (entry_value + (window - price) * shares)
+            exit_idx[count - 1] = -1
+            exit_reason[count - 1] = EXIT_OPEN
+            next_bar = n
+            break
+
+        x = e + np.argmax(hits)
+        equity[e:x] = cash + (entry_value + (closes[e:x] - price) * shares)
+        exit_value = shares * closes[x]
+        cash += exit_value - exit_value * commission_rate
+        equity[x] = cash
+        exit_idx[count - 1] = x
+        exit_reason[count - 1] = EXIT_STOP_LOSS if closes[x] <= stop_loss else EXIT_TAKE_PROFIT
+        next_bar = x + 1
+
+    equity[next_bar:] = cash
+
+    return (entry_idx[:count], exit_idx[:count], trade_shares[:count],
+            exit_reason[:count], equity)
+
+
+@njit(cache=True)
+def position_size_kernel(equity, entry_price, stop_loss, volatility, cash,
+                         risk_per_trade, max_position_exposure,
+                         max_volume_participation, commission_rate):
+    """
+    Risk-based position size in shares, rounded down to IDX lots
+
+    Scalar core of Portfolio.calculate_position_size; pass volatility=0 to
+    skip the liquidity cap.
+
+    Returns:
+        Number of shares (multiple of 100)
+    """
+    stop_distance = entry_price - stop_loss
+    if stop_distance <= 0:
+        return 0
+
+    # Base position size from risk, capped by exposure and liquidity
+    position_value = equity * risk_per_trade / stop_distance * entry_price
+    max_position_value = equity * max_position_exposure
+    if max_position_value < position_value:
+        position_value = max_position_value
+    if volatility != 0:
+        max_liquidity_value = volatility * max_volume_participation * entry_price
+        if max_liquidity_value < position_value:
+            position_value = max_liquidity_value
+
+    # Round the smaller of the target and what cash covers down to lots
+    target_shares = position_value / entry_price
+    affordable_shares = cash / (entry_price * (1 + commission_rate))
+    return int(max(min(target_shares, affordable_shares), 0.0)) // 100 * 100
+
+
+@njit(cache=True)
+def sltp_scan(prices, entry_prices, shares, stop_losses, take_profits):
+    """
+    Mark open positions and flag the ones that hit their SL/TP
+
+    A take profit of 0 means none is set; the stop loss wins when both hit.
+
+    Returns:
+        Tuple of (unrealized_pnl, close_mask, exit_reason) per position
+    """
+    n = len(prices)
+    unrealized = np.empty(n, dtype=np.float64)
+    close_mask = np.zeros(n, dtype=np.bool_)
+    exit_reason = np.zeros(n, dtype=np.int8)
+
+    for i in range(n):
+        price = prices[i]
+        unrealized[i] = (price - entry_prices[i]) * shares[i]
+        if price <= stop_losses[i]:
+            close_mask[i] = True
+            exit_reason[i] = EXIT_STOP_LOSS
+        elif take_profits[i] != 0 and price >= take_profits[i]:
+            close_mask[i] = True
+            exit_reason[i] = EXIT_TAKE_PROFIT
+
+    return unrealized, close_mask, exit_reason
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class JsonCache:
+    """
+    Small persistent key -> value cache stored as one JSON file.
+    Entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                # Missing or corrupt cache file: start empty
+                self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None or time.time() - entry["time"] > self.ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key, value):
+        with self._lock:
+            self._load()[key] = {"time": time.time(), "value": value}
+            self._dirty = True
+
+    def save(self):
+        """
+        Write pending entries to disk (atomically, via a temp file).
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path), suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -1,46 +1,107 @@
 # Configuration for the Swing Trading Filter
 import os
+import stat
+from functools import lru_cache
 
 # Watchlist Configuration
 # Available lists: default, lq45, idx_liquid (or custom .txt file path)
 DEFAULT_WATCHLIST = "default"
 WATCHLISTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "watchlists")
+# Bump when parsing changes so older .npy sidecars are ignored
+WATCHLIST_SIDECAR_VERSION = 2
 
 
+@lru_cache(maxsize=32)
 def load_watchlist(name_or_path=None):
     """
     Load tickers from a watchlist file.
     Accepts: list name (e.g., 'lq45') or full path to .txt file
+    Results are cached per name/path and returned as a tuple; copy to a list
+    before mutating.
     """
     name_or_path = name_or_path or DEFAULT_WATCHLIST
 
-    if os.path.isfile(name_or_path):
+    # One stat for the direct-path check
+    try:
+        st = os.stat(name_or_path)
+    except (OSError, ValueError):
+        st = None
+    if st is not None and stat.S_ISREG(st.st_mode):
         filepath = name_or_path
     else:
         filepath = os.path.join(WATCHLISTS_DIR, f"{name_or_path}.txt")
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            print(f"Warning: Watchlist '{name_or_path}' not found. Using empty list.")
+            return ()
+
+    # Pre-normalized sidecar (<file>.v<N>.npy), reused while newer than the
+    # source. Only lists in WATCHLISTS_DIR get one, so nothing is written
+    # next to user-supplied files elsewhere
+    import numpy as np
+
+    sidecar = None
+    if os.path.dirname(os.path.realpath(filepath)) == os.path.realpath(WATCHLISTS_DIR):
+        sidecar = f"{filepath}.v{WATCHLIST_SIDECAR_VERSION}.npy"
+        try:
+            if os.stat(sidecar).st_mtime >= st.st_mtime:
+                return tuple(np.load(sidecar).tolist())
+        except (OSError, ValueError):
+            pass
 
-    if not os.path.exists(filepath):
-        print(f"Warning: Watchlist '{name_or_path}' not found. Using empty list.")
-        return []
-
-    tickers = []
     with open(filepath, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                ticker = line.upper()
-                if not ticker.endswith(".JK"):
-                    ticker = f"{ticker}.JK"
-                tickers.append(ticker)
+        lines = f.read().upper().splitlines()
+    parsed = [
+        t if t.endswith(".JK") else f"{t}.JK"
+        for line in lines
+        for t in (line.strip(),)
+        if t and not t.startswith("#")
+    ]
+    tickers = tuple(dict.fromkeys(parsed))
+    if len(tickers) < len(parsed):
+        print(
+            f"Note: watchlist '{name_or_path}' lists {len(parsed) - len(tickers)} "
+            "ticker(s) more than once; duplicates ignored."
+        )
+
+    if sidecar is not None:
+        try:
+            np.save(sidecar, np.array(tickers, dtype=str))
+        except OSError:
+            # Read-only location: just parse the text file next time
+            pass
     return tickers
 
 
-# Legacy: Keep TICKERS for backward compatibility
-TICKERS = load_watchlist(DEFAULT_WATCHLIST)
+def normalize_tickers(tickers):
+    """
+    Upper-case tickers, add the .JK suffix and drop repeats, keeping order.
+    Returns a tuple so the result can be shared between callers.
+    """
+    normalized = [
+        t if t.endswith(".JK") else f"{t}.JK" for t in (t.upper() for t in tickers)
+    ]
+    unique = tuple(dict.fromkeys(normalized))
+    if len(unique) < len(normalized):
+        print(f"Note: ignoring {len(normalized) - len(unique)} duplicate ticker(s)")
+    return unique
+
+
+# Legacy: Keep TICKERS for backward compatibility (loaded on first access)
+def __getattr__(name):
+    if name == "TICKERS":
+        return load_watchlist(DEFAULT_WATCHLIST)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Timeframe for data fetching
 TIMEFRAME = "1d"  # Daily candles
 HISTORY_PERIOD = "2y"  # Need enough data for weekly EMA50 (55+ weeks)
+SCAN_WORKERS = 4  # Threads analyzing fetched tickers (numba kernels run without the GIL)
+SCAN_PROCESSES = None  # Processes instead of threads (None = all CPUs without numba, 0 = threads)
+SCAN_CHUNK_SIZE = 16  # Tickers per process task, to amortize pickling
+INDICATOR_DTYPE = "float64"  # "float32" halves indicator memory traffic (~7 significant digits)
+INCREMENTAL_ANALYSIS = True  # Resume indicators from the last scan (cache/strategy_state.pkl)
 
 # Strategy Parameters (optimized for 3-10 day IDX swings)
 FAST_EMA = 13  # Faster than 20 for earlier trend capture
@@ -69,6 +130,9 @@ VOL_RATIO_MIN = 1.2  # Minimum volume ratio for quality signals
 ENABLE_MCAP_FILTER = False
 MIN_MARKET_CAP = 5e12  # 5 Trillion IDR minimum (expands to quality mid-caps)
 
+# Stock info (market cap, sector, ...) is cached on disk for this long
+STOCK_INFO_CACHE_TTL = 24 * 60 * 60  # seconds; use --refresh to bypass
+
 # Display market cap info (without filtering)
 # Set True to show MCap column (adds ~1 min for 45 stocks)
 SHOW_MCAP_INFO = True
@@ -128,6 +192,7 @@ MARKET_FILTER_MODE = "TAG"  # Don't hard-block, use scoring instead
 BACKTEST_START_DATE = "2022-01-01"
 BACKTEST_END_DATE = "2024-12-31"
 INITIAL_CAPITAL = 100000000  # 100M IDR
+BACKTEST_WORKERS = None  # Processes for per-ticker backtests (None = all CPUs, 1 = serial)
 
 # Risk Management
 RISK_PER_TRADE = 0.01  # 1% risk per trade
@@ -142,15 +207,18 @@ SLIPPAGE_RATE = 0.002  # 0.2% average slippage
 
 # Rate Limiting for Yahoo Finance API
 ENABLE_RATE_LIMITER = True
-REQUEST_DELAY_MIN = 2.0  # Minimum delay between requests (seconds)
-REQUEST_DELAY_MAX = 4.0  # Maximum delay between requests (seconds)
+REQUESTS_PER_MINUTE = 30  # Sliding-window cap; requests only wait once the last 60s are full
 MAX_RETRIES = 2  # Maximum retry attempts (reduced to fail faster)
-RETRY_BACKOFF_BASE = 3  # Exponential backoff multiplier (3^n seconds)
+RETRY_BACKOFF_BASE = 3  # Minimum retry sleep; later sleeps are jittered up to 3x the previous one
+RETRY_MAX_SLEEP = 30  # Cap on a single retry sleep (seconds)
 MAX_CONSECUTIVE_429 = 2  # Stop after N consecutive 429 errors
-BATCH_SIZE = 5  # Smaller batches to avoid DNS thread exhaustion
-BATCH_DELAY = 3.0  # Delay between batch requests (seconds)
+BATCH_SIZE = 20  # Tickers per yf.download request (Yahoo accepts up to 20 symbols per call)
+INFO_BATCH_SIZE = 5  # Tickers per stock info chunk (yfinance sends one request per ticker)
+HTTP_POOL_SIZE = 20  # Pooled connections when falling back to plain requests
+FETCH_INITIAL_CONCURRENCY = 2  # Batches in flight at start (AIMD: +1 per success)
+FETCH_MAX_CONCURRENCY = 4  # Upper bound on concurrent batch fetches (halved on 429/5xx)
 
-# User-Agent rotation for Yahoo Finance requests
+# User-Agent rotation for Yahoo Finance requests (plain requests sessions only)
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -1,12 +1,34 @@
+import glob
 import os
-import time
+import random
+import re
+import threading
 import warnings
-
+from datetime import date
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+
+import numpy as np
 import pandas as pd
+import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from . import config
-from .rate_limiter import get_rate_limiter, retry_with_backoff
+from .cache import JsonCache
+from .progress import progress
+from .rate_limiter import (
+    CircuitBreakerOpen,
+    ConcurrencyController,
+    get_rate_limiter,
+    is_throttle_error,
+    retry_with_backoff,
+)
 
 warnings.filterwarnings("ignore", category=FutureWarning, module="yfinance")
 
@@ -18,10 +40,55 @@ yf.set_tz_cache_location(cache_dir)
 rate_limiter = get_rate_limiter()
 
 
+def _new_session():
+    """
+    Create the HTTP session shared by every yfinance call, so connections
+    (and their TLS handshakes) are reused across requests and threads.
+    """
+    try:
+        from curl_cffi import requests as curl_requests
+    except ImportError:
+        # Plain requests: needs a browser User-Agent and a bigger pool
+        session = requests.Session()
+        session.headers["User-Agent"] = random.choice(config.USER_AGENTS)
+        adapter = HTTPAdapter(
+            pool_connections=config.HTTP_POOL_SIZE,
+            pool_maxsize=config.HTTP_POOL_SIZE,
+            max_retries=Retry(total=0),  # retries are done by retry_with_backoff
+        )
+        session.mount("https://", adapter)
+        return session
+
+    # curl_cffi impersonates Chrome's TLS fingerprint, User-Agent included
+    return curl_requests.Session(impersonate="chrome")
+
+
+session = _new_session()
+
+# Fundamentals change slowly; reruns within the TTL skip the network entirely
+info_cache = JsonCache(
+    os.path.join(cache_dir, "stock_info.json"), ttl=config.STOCK_INFO_CACHE_TTL
+)
+
+# Daily snapshots of slow-moving series (e.g. the market index)
+market_cache_dir = os.path.join(cache_dir, "market")
+
+# Per-ticker OHLCV history, extended incrementally on each period fetch
+ohlcv_cache_dir = os.path.join(cache_dir, "ohlcv")
+HISTORY_COVERAGE_SLACK = pd.Timedelta(days=7)  # holidays at the period start
+_PERIOD_RE = re.compile(r"(\d+)(d|wk|mo|y)")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+# (divisor, format) per market cap tier, largest first (see format_market_cap)
+MARKET_CAP_FORMATS = ((1e12, "%.1fT"), (1e9, "%.0fB"), (1e6, "%.0fM"))
+
+
 @retry_with_backoff()
 def fetch_data(ticker, period=None, interval=None, start_date=None, end_date=None):
     """
     Fetch historical OHLCV data for a single ticker.
+    Period requests are served from the on-disk history cache when possible,
+    downloading only the bars since the last cached one.
 
     Args:
         ticker: Stock ticker symbol (e.g., 'BBCA.JK')
@@ -33,53 +100,198 @@ def fetch_data(ticker, period=None, interval=None, start_date=None, end_date=Non
     Returns:
         DataFrame with OHLCV data or None if failed
     """
-    rate_limiter.wait()
-
     try:
         if start_date and end_date:
-            df = yf.download(
-                ticker,
-                start=start_date,
-                end=end_date,
-                interval=interval or config.TIMEFRAME,
-                progress=False,
-                auto_adjust=True,
-            )
-        else:
-            period = period or config.HISTORY_PERIOD
-            interval = interval or config.TIMEFRAME
-            df = yf.download(
-                ticker,
-                period=period,
-                interval=interval,
-                progress=False,
-                auto_adjust=True,
+            return _download_single(
+                ticker, interval or config.TIMEFRAME, start=start_date, end=end_date
             )
 
-        if df.empty:
-            return None
-
-        # Handle multi-index columns
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
+        period = period or config.HISTORY_PERIOD
+        interval = interval or config.TIMEFRAME
 
-        # Normalize column names to title case (auto_adjust=True makes them lowercase)
-        df.columns = [
-            col.title() if isinstance(col, str) else col for col in df.columns
-        ]
+        cached = _load_history(ticker, period, interval)
+        if cached is not None:
+            fresh = _download_single(ticker, interval, start=_overlap_start(cached))
+            df = _merge_history(cached, fresh, period)
+            if df is not None:
+                _store_history(ticker, period, interval, df)
+                return df
 
+        df = _download_single(ticker, interval, period=period)
+        if df is not None:
+            _store_history(ticker, period, interval, df)
         return df
     except Exception as e:
         print(f"Error fetching data for {ticker}: {e}")
         raise
 
 
+def _download_single(ticker, interval, **date_range):
+    """
+    yf.download for one ticker; date_range is period=... or start=/end=.
+
+    Returns:
+        DataFrame with title-case OHLCV columns or None if empty
+    """
+    rate_limiter.wait()
+
+    df = yf.download(
+        ticker,
+        interval=interval,
+        progress=False,
+        auto_adjust=True,
+        session=session,
+        **date_range,
+    )
+
+    if len(df.index) == 0:
+        return None
+
+    # Handle multi-index columns: keep the price level, drop the ticker level
+    if df.columns.nlevels > 1:
+        df.columns = df.columns.droplevel(list(range(1, df.columns.nlevels)))
+
+    # Normalize column names to title case (auto_adjust=True makes them lowercase)
+    df.columns = [col.title() if isinstance(col, str) else col for col in df.columns]
+
+    return df
+
+
+def _cache_name(ticker):
+    return re.sub(r"[^A-Za-z0-9.-]", "", ticker)
+
+
+def _period_start(period, index):
+    """
+    First timestamp covered by a yfinance period string such as '2y' or
+    '6mo', in the timezone of index; None for periods like 'max' or 'ytd'.
+    """
+    match = _PERIOD_RE.fullmatch(period)
+    if not match:
+        return None
+    count, unit = int(match.group(1)), match.group(2)
+    start = pd.Timestamp.today().normalize() - pd.DateOffset(
+        **{_PERIOD_UNITS[unit]: count}
+    )
+    if index.tz is not None:
+        start = start.tz_localize(index.tz)
+    return start
+
+
+def _load_history(ticker, period, interval):
+    """
+    Cached history for ticker if it exists and reaches back far enough for
+    period; None otherwise.
+    """
+    path = os.path.join(ohlcv_cache_dir, f"{_cache_name(ticker)}_{interval}.pkl")
+    try:
+        df = pd.read_pickle(path)
+    except Exception:
+        return None
+    if len(df.index) == 0:
+        return None
+
+    period_start = _period_start(period, df.index)
+    requested_start = df.attrs.get("requested_start")
+    if period_start is None or requested_start is None:
+        return None
+    if requested_start > period_start + HISTORY_COVERAGE_SLACK:
+        return None
+    return df
+
+
+def _store_history(ticker, period, interval, df):
+    """Write ticker history to the cache (atomically, via a temp file)."""
+    period_start = _period_start(period, df.index)
+    if period_start is None:
+        return
+
+    df = df.copy(deep=False)
+    df.attrs["requested_start"] = period_start
+    os.makedirs(ohlcv_cache_dir, exist_ok=True)
+    path = os.path.join(ohlcv_cache_dir, f"{_cache_name(ticker)}_{interval}.pkl")
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _overlap_start(cached):
+    """
+    Start date for an incremental download: the second-to-last cached bar,
+    so the last (possibly still forming) bar is replaced and the one before
+    it can be compared to detect dividend/split re-adjustments.
+    """
+    overlap = cached.index[-2] if len(cached) > 1 else cached.index[-1]
+    return overlap.strftime("%Y-%m-%d")
+
+
+def _merge_history(cached, fresh, period):
+    """
+    Append freshly downloaded bars to cached history, trimmed to period.
+
+    Returns:
+        Merged DataFrame, or None if the overlapping bar no longer matches
+        (prices were re-adjusted) and the full history must be refetched
+    """
+    if fresh is not None and len(fresh.index):
+        overlap = cached.index[-2] if len(cached) > 1 else cached.index[-1]
+        if set(fresh.columns) != set(cached.columns):
+            return None
+        if overlap not in fresh.index or not np.isclose(
+            fresh.at[overlap, "Close"], cached.at[overlap, "Close"], rtol=1e-6
+        ):
+            return None
+        cached = pd.concat(
+            [cached[cached.index < fresh.index[0]], fresh[cached.columns]]
+        )
+
+    df = cached[cached.index >= _period_start(period, cached.index)]
+    return df if len(df.index) else None
+
+
+def fetch_data_cached(ticker, period=None, interval=None):
+    """
+    Fetch historical data for a single ticker, reusing today's copy from disk.
+    The first call of the day downloads via fetch_data() and pickles the
+    result under cache/market/; older snapshots of the same ticker are removed.
+
+    Args:
+        ticker: Stock or index ticker symbol (e.g., '^JKSE')
+        period: Time period (e.g., '1mo', '1y', '2y')
+        interval: Data interval (e.g., '1d', '1wk')
+
+    Returns:
+        DataFrame with OHLCV data or None if failed
+    """
+    period = period or config.HISTORY_PERIOD
+    interval = interval or config.TIMEFRAME
+    prefix = f"{_cache_name(ticker)}_{period}_{interval}_"
+    path = os.path.join(
+        market_cache_dir, f"{prefix}{date.today().strftime('%Y%m%d')}.pkl"
+    )
+
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        # Missing or unreadable snapshot: fetch and (over)write it
+        pass
+
+    df = fetch_data(ticker, period=period, interval=interval)
+    if df is not None:
+        os.makedirs(market_cache_dir, exist_ok=True)
+        stale_pattern = os.path.join(market_cache_dir, f"{glob.escape(prefix)}*.pkl")
+        for stale in glob.glob(stale_pattern):
+            os.remove(stale)
+        df.to_pickle(path)
+    return df
+
+
 def fetch_data_batch(
     tickers, period=None, interval=None, start_date=None, end_date=None
 ):
     """
     Fetch historical data for multiple tickers with proper rate limiting.
-    Uses sequential fetching with small batches to avoid DNS/threading issues.
+    Collects fetch_data_batch_iter() into a dict in the caller's ticker order.
 
     Args:
         tickers: List of stock ticker symbols
@@ -94,56 +306,137 @@ def fetch_data_batch(
     if not tickers:
         return {}
 
-    results = {}
-    total = len(tickers)
+    results = dict(
+        fetch_data_batch_iter(tickers, period, interval, start_date, end_date)
+    )
 
-    # For large lists, use pure sequential fetching to avoid DNS thread issues
-    use_sequential = total > 20
+    # Keep the caller's ticker order regardless of completion order
+    return {ticker: results[ticker] for ticker in tickers if ticker in results}
 
-    if use_sequential:
-        print(f"Fetching data for {total} tickers (sequential mode)...")
-        for idx, ticker in enumerate(tickers, 1):
-            print(f"  [{idx}/{total}] {ticker}...", end="\r")
-            try:
-                df = fetch_data(ticker, period, interval, start_date, end_date)
-                if df is not None and not df.empty:
-                    results[ticker] = df
-            except Exception as e:
-                # Skip failed tickers silently to avoid spam
-                continue
-            # Small delay between tickers
-            if idx < total:
-                time.sleep(0.5)
-    else:
-        # For small lists, use batch fetching
-        batch_size = config.BATCH_SIZE
-        total_batches = (total + batch_size - 1) // batch_size
-        print(f"Fetching data for {total} tickers in {total_batches} batches...")
 
-        for i in range(0, total, batch_size):
-            batch = tickers[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-            print(f"  Batch {batch_num}/{total_batches}...", end="\r")
+def fetch_data_batch_iter(
+    tickers, period=None, interval=None, start_date=None, end_date=None
+):
+    """
+    Fetch historical data for multiple tickers, yielding each as it arrives.
+    Batches are fetched concurrently on a thread pool; the shared rate limiter
+    spaces out the actual requests and an AIMD controller caps how many are
+    in flight (starts low, grows on success, halves on 429/5xx). At most
+    2x the concurrency cap of batches are queued ahead of the consumer, so a
+    slow consumer holds back new downloads instead of piling up DataFrames.
 
-            try:
-                batch_result = _fetch_batch_chunk(
-                    batch, period, interval, start_date, end_date
-                )
-                results.update(batch_result)
-                if i + batch_size < total:
-                    time.sleep(config.BATCH_DELAY)
-            except Exception:
-                # Fall back to individual fetching
-                for ticker in batch:
+    Args:
+        tickers: List of stock ticker symbols
+        period: Time period (e.g., '1mo', '1y', '2y')
+        interval: Data interval (e.g., '1d', '1wk')
+        start_date: Start date for historical data (YYYY-MM-DD)
+        end_date: End date for historical data (YYYY-MM-DD)
+
+    Yields:
+        (ticker, DataFrame) tuples in completion order; failed tickers are skipped,
+        and a tripped circuit breaker ends the iteration early
+    """
+    if not tickers:
+        return
+
+    total = len(tickers)
+    batch_size = config.BATCH_SIZE
+    batches = [list(tickers[i : i + batch_size]) for i in range(0, total, batch_size)]
+    total_batches = len(batches)
+    controller = ConcurrencyController()
+    max_pending = 2 * controller.maximum
+    fetched = 0
+
+    print(f"Fetching data for {total} tickers in {total_batches} batches...")
+
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor, progress(
+        total_batches, "Batches", unit="batch"
+    ) as pbar:
+        queued = iter(batches)
+        pending = set()
+        tripped = False
+        try:
+            while True:
+                for batch in queued:
+                    pending.add(
+                        executor.submit(
+                            _fetch_batch_with_fallback,
+                            batch,
+                            controller,
+                            period,
+                            interval,
+                            start_date,
+                            end_date,
+                        )
+                    )
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pbar.update(1)
                     try:
-                        df = fetch_data(ticker, period, interval, start_date, end_date)
-                        if df is not None and not df.empty:
-                            results[ticker] = df
-                    except Exception:
+                        batch_result = future.result()
+                    except CircuitBreakerOpen as e:
+                        if not tripped:
+                            # Stop queueing, but still hand back the batches
+                            # already in flight so the caller keeps them
+                            print(f"\nStopped fetching data: {e}")
+                            tripped = True
+                            queued = iter(())
+                            pending = {f for f in pending if not f.cancel()}
                         continue
+                    for ticker, df in batch_result.items():
+                        fetched += 1
+                        yield ticker, df
+        finally:
+            # Consumer stopped early or a batch raised
+            for future in pending:
+                future.cancel()
 
-    print(f"\nSuccessfully fetched {len(results)}/{total} tickers")
-    return results
+    print(f"Successfully fetched {fetched}/{total} tickers")
+
+
+def _fetch_batch_with_fallback(
+    batch, controller, period=None, interval=None, start_date=None, end_date=None
+):
+    """
+    Fetch one batch via _fetch_batch_chunk, falling back to per-ticker
+    fetch_data calls if the batch request fails.
+
+    Returns:
+        Dictionary mapping ticker -> DataFrame
+    """
+    with controller:
+        try:
+            batch_result = _fetch_batch_chunk(
+                batch, period, interval, start_date, end_date
+            )
+            controller.record_success()
+            return batch_result
+        except CircuitBreakerOpen:
+            raise
+        except Exception as e:
+            if is_throttle_error(e):
+                controller.record_throttle()
+
+    # Fall back to individual fetching
+    batch_result = {}
+    for ticker in batch:
+        with controller:
+            try:
+                df = fetch_data(ticker, period, interval, start_date, end_date)
+            except CircuitBreakerOpen:
+                raise
+            except Exception as e:
+                if is_throttle_error(e):
+                    controller.record_throttle()
+                continue
+            controller.record_success()
+        if df is not None and len(df.index):
+            batch_result[ticker] = df
+    return batch_result
 
 
 @retry_with_backoff()
@@ -152,6 +445,8 @@ def _fetch_batch_chunk(
 ):
     """
     Internal function to fetch a chunk of tickers.
+    Period requests reuse cached history and download only the new bars,
+    falling back to a full download for tickers without usable history.
 
     Args:
         tickers: List of tickers (should be <= BATCH_SIZE)
@@ -163,88 +458,40 @@ def _fetch_batch_chunk(
     Returns:
         Dictionary mapping ticker -> DataFrame
     """
-    rate_limiter.wait()
-
     try:
-        # Download data for multiple tickers at once
         if start_date and end_date:
-            df = yf.download(
+            return _download_batch(
                 tickers,
+                interval or config.TIMEFRAME,
                 start=start_date,
                 end=end_date,
-                interval=interval or config.TIMEFRAME,
-                progress=False,
-                auto_adjust=True,
-                group_by="ticker",
             )
-        else:
-            period = period or config.HISTORY_PERIOD
-            interval = interval or config.TIMEFRAME
-            df = yf.download(
-                tickers,
-                period=period,
-                interval=interval,
-                progress=False,
-                auto_adjust=True,
-                group_by="ticker",
-            )
-
-        if df.empty:
-            return {}
 
-        # Parse multi-ticker results
+        period = period or config.HISTORY_PERIOD
+        interval = interval or config.TIMEFRAME
         results = {}
 
-        if len(tickers) == 1:
-            # Single ticker - but may still have multi-index with group_by="ticker"
-            ticker = tickers[0]
-            if not df.empty:
-                # Handle multi-index columns if present
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = df.columns.get_level_values(1)
-                # Handle case where columns might still be tuples
-                elif df.columns.size > 0 and isinstance(df.columns[0], tuple):
-                    df.columns = [
-                        col[1] if isinstance(col, tuple) else col for col in df.columns
-                    ]
-
-                # Normalize column names to title case
-                df.columns = [
-                    col.title() if isinstance(col, str) else col for col in df.columns
-                ]
-                results[ticker] = df
-        else:
-            # Multiple tickers - split by ticker
-            for ticker in tickers:
-                try:
-                    ticker_df = (
-                        df[ticker]
-                        if ticker in df.columns.get_level_values(0)
-                        else pd.DataFrame()
-                    )
-                    if not ticker_df.empty:
-                        # Handle case where columns might still be tuples
-                        if ticker_df.columns.size > 0 and isinstance(
-                            ticker_df.columns[0], tuple
-                        ):
-                            ticker_df.columns = [
-                                col[1] if isinstance(col, tuple) else col
-                                for col in ticker_df.columns
-                            ]
-
-                        # Normalize column names to title case
-                        ticker_df.columns = [
-                            col.title() if isinstance(col, str) else col
-                            for col in ticker_df.columns
-                        ]
-                        # Drop NaN rows
-                        ticker_df = ticker_df.dropna(subset=["Close"])
-                        if not ticker_df.empty:
-                            results[ticker] = ticker_df
-                except (KeyError, AttributeError):
-                    # Ticker not found in results
-                    continue
-
+        # Incremental update for tickers with cached history
+        cached = {}
+        for ticker in tickers:
+            df = _load_history(ticker, period, interval)
+            if df is not None:
+                cached[ticker] = df
+        if cached:
+            start = min(_overlap_start(df) for df in cached.values())
+            fresh = _download_batch(list(cached), interval, start=start)
+            for ticker, df in cached.items():
+                merged = _merge_history(df, fresh.get(ticker), period)
+                if merged is not None:
+                    results[ticker] = merged
+
+        # Full download for the rest (no cache, too short, or re-adjusted)
+        missing = [ticker for ticker in tickers if ticker not in results]
+        if missing:
+            results.update(_download_batch(missing, interval, period=period))
+
+        for ticker, df in results.items():
+            _store_history(ticker, period, interval, df)
         return results
 
     except Exception as e:
@@ -252,42 +499,171 @@ def _fetch_batch_chunk(
         raise
 
 
+def _download_batch(tickers, interval, **date_range):
+    """
+    yf.download for several tickers at once; date_range is period=... or
+    start=/end=.
+
+    Returns:
+        Dictionary mapping ticker -> DataFrame
+    """
+    rate_limiter.wait()
+
+    # Download data for multiple tickers at once
+    df = yf.download(
+        tickers,
+        interval=interval,
+        progress=False,
+        auto_adjust=True,
+        group_by="ticker",
+        threads=True,
+        session=session,
+        **date_range,
+    )
+
+    if len(df.index) == 0:
+        return {}
+
+    # Parse multi-ticker results
+    results = {}
+
+    if len(tickers) == 1:
+        # Single ticker - but may still have multi-index with group_by="ticker"
+        ticker = tickers[0]
+        if len(df.index):
+            # Handle multi-index columns if present (ticker level first)
+            if df.columns.nlevels > 1:
+                df.columns = df.columns.droplevel(0)
+            # Handle case where columns might still be tuples
+            elif df.columns.size > 0 and isinstance(df.columns[0], tuple):
+                df.columns = [
+                    col[1] if isinstance(col, tuple) else col for col in df.columns
+                ]
+
+            # Normalize column names to title case
+            df.columns = [
+                col.title() if isinstance(col, str) else col for col in df.columns
+            ]
+            results[ticker] = df
+    else:
+        # Multiple tickers - split by ticker. Rows empty for every ticker are
+        # dropped once for the whole batch; a ticker-specific NaN close (a day
+        # only that ticker did not trade) is dropped per ticker, and only for
+        # tickers that have one.
+        df = df.dropna(how="all")
+        top_level = set()
+        missing_close = {}
+        if df.columns.nlevels > 1:
+            top_level = set(df.columns.levels[0])
+            close_key = next(
+                (c for c in df.columns.levels[1] if str(c).title() == "Close"), None
+            )
+            if close_key is not None:
+                missing_close = (
+                    df.xs(close_key, axis=1, level=1).isna().any().to_dict()
+                )
+        for ticker in tickers:
+            if ticker not in top_level:
+                # Ticker not found in results
+                continue
+            try:
+                ticker_df = df.xs(ticker, axis=1, level=0, drop_level=True)
+            except KeyError:
+                continue
+
+            # Normalize column names to title case
+            ticker_df.columns = [
+                col.title() if isinstance(col, str) else col
+                for col in ticker_df.columns
+            ]
+            # Drop NaN rows
+            if missing_close.get(ticker, True):
+                ticker_df = ticker_df.dropna(subset=["Close"])
+            if len(ticker_df.index):
+                results[ticker] = ticker_df
+
+    return results
+
+
 @retry_with_backoff()
-def get_stock_info(ticker):
+def get_stock_info(ticker, refresh=False):
     """
     Fetch fundamental info for a single ticker.
+    A fresh entry in the on-disk info cache is returned without a request;
+    fetched info is written back to it.
 
     Args:
         ticker: Stock ticker symbol
+        refresh: Ignore cached info and refetch
 
     Returns:
         Dictionary with stock info or None if failed
     """
+    if not refresh:
+        info = info_cache.get(ticker)
+        if info is not None:
+            return info
+
     rate_limiter.wait()
 
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        stock = yf.Ticker(ticker, session=session)
+        info = _extract_info(stock.info)
+    except Exception as e:
+        print(f"Error fetching info for {ticker}: {e}")
+        raise
+
+    info_cache.set(ticker, info)
+    info_cache.save()
+    return info
+
+
+def _extract_info(info):
+    """Pick the fields we use out of a yfinance .info dict."""
+    return {
+        "market_cap": info.get("marketCap"),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "pe_ratio": info.get("trailingPE"),
+        "pbv": info.get("priceToBook"),
+        "dividend_yield": info.get("dividendYield"),
+    }
+
+
+@retry_with_backoff()
+def _fetch_info_chunk(tickers):
+    """
+    Internal function to fetch info for a chunk of tickers through one
+    yf.Tickers object, under a single rate-limit wait.
+
+    Args:
+        tickers: List of tickers (should be <= INFO_BATCH_SIZE)
+
+    Returns:
+        Dictionary mapping ticker -> stock info dict
+    """
+    rate_limiter.wait()
+
+    try:
+        stocks = yf.Tickers(" ".join(tickers), session=session)
         return {
-            "market_cap": info.get("marketCap"),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "pe_ratio": info.get("trailingPE"),
-            "pbv": info.get("priceToBook"),
-            "dividend_yield": info.get("dividendYield"),
+            ticker: _extract_info(stocks.tickers[ticker].info) for ticker in tickers
         }
     except Exception as e:
-        print(f"Error fetching info for {ticker}: {e}")
+        print(f"Error in batch info fetch: {e}")
         raise
 
 
-def fetch_stock_info_batch(tickers):
+def fetch_stock_info_batch(tickers, refresh=False):
     """
     Fetch stock info for multiple tickers with proper rate limiting.
-    Fetches each ticker individually with delays to avoid rate limits.
+    Tickers with a fresh entry in the on-disk info cache are served from it;
+    the rest are fetched in INFO_BATCH_SIZE chunks on a thread pool, falling back
+    to per-ticker requests when a chunk fails.
 
     Args:
         tickers: List of stock ticker symbols
+        refresh: Ignore cached info and refetch every ticker
 
     Returns:
         Dictionary mapping ticker -> stock info dict
@@ -298,21 +674,75 @@ def fetch_stock_info_batch(tickers):
     results = {}
     total = len(tickers)
 
-    print(f"Fetching stock info for {total} tickers...")
+    if not refresh:
+        for ticker in tickers:
+            info = info_cache.get(ticker)
+            if info is not None:
+                results[ticker] = info
+    to_fetch = [ticker for ticker in tickers if ticker not in results]
+
+    batch_size = config.INFO_BATCH_SIZE
+    batches = [
+        to_fetch[i : i + batch_size] for i in range(0, len(to_fetch), batch_size)
+    ]
+    controller = ConcurrencyController()
+
+    cached_msg = f" ({len(results)} cached)" if results else ""
+    print(f"Fetching stock info for {total} tickers{cached_msg}...")
 
-    for idx, ticker in enumerate(tickers, 1):
-        print(f"Fetching info {idx}/{total}: {ticker}...", end="\r")
+    def fetch_batch(batch):
+        with controller:
+            try:
+                batch_result = _fetch_info_chunk(batch)
+                controller.record_success()
+                return batch_result
+            except CircuitBreakerOpen:
+                raise
+            except Exception as e:
+                if is_throttle_error(e):
+                    controller.record_throttle()
 
+        # Fall back to individual fetching
+        batch_result = {}
+        for ticker in batch:
+            with controller:
+                try:
+                    batch_result[ticker] = get_stock_info(ticker, refresh=refresh)
+                except CircuitBreakerOpen:
+                    raise
+                except Exception as e:
+                    if is_throttle_error(e):
+                        controller.record_throttle()
+                    print(f"\nFailed to fetch info for {ticker}: {e}")
+                    batch_result[ticker] = None
+                    continue
+                controller.record_success()
+        return batch_result
+
+    with ThreadPoolExecutor(max_workers=controller.maximum) as executor, progress(
+        len(batches), "Info batches", unit="batch"
+    ) as pbar:
+        futures = [executor.submit(fetch_batch, batch) for batch in batches]
         try:
-            info = get_stock_info(ticker)
-            results[ticker] = info
-        except Exception as e:
-            print(f"\nFailed to fetch info for {ticker}: {e}")
-            results[ticker] = None
-            continue
+            for future in as_completed(futures):
+                pbar.update(1)
+                for ticker, info in future.result().items():
+                    results[ticker] = info
+                    if info is not None:
+                        info_cache.set(ticker, info)
+        except CircuitBreakerOpen as e:
+            # Info is display/filter data only: keep what was fetched and
+            # leave the rest as None rather than failing the whole scan
+            for future in futures:
+                future.cancel()
+            print(f"\nStopped fetching stock info: {e}")
+        finally:
+            info_cache.save()
+
+    results = {ticker: results.get(ticker) for ticker in tickers}
 
     print(
-        f"\nSuccessfully fetched info for {len([r for r in results.values() if r])}/{total} tickers"
+        f"Successfully fetched info for {len([r for r in results.values() if r])}/{total} tickers"
     )
     return results
 
@@ -327,8 +757,8 @@ def get_latest_price(df):
     Returns:
         Latest close price or None
     """
-    if df is not None and not df.empty:
-        return df["Close"].iloc[-1]
+    if df is not None and len(df.index):
+        return float(df["Close"].to_numpy()[-1])
     return None
 
 
@@ -350,3 +780,24 @@ def format_market_cap(mcap):
         return f"{mcap / 1e9:.0f}B"
     else:
         return f"{mcap / 1e6:.0f}M"
+
+
+def format_market_cap_array(mcaps):
+    """
+    Vectorized format_market_cap for a whole column of market caps.
+
+    Args:
+        mcaps: Sequence of market cap values in IDR (None/NaN allowed)
+
+    Returns:
+        NumPy array of formatted strings ('-' for missing values)
+    """
+    mcaps = np.asarray(mcaps, dtype=np.float64)
+    tiers = np.select([mcaps >= 1e12, mcaps >= 1e9], [0, 1], default=2)
+
+    formatted = np.full(len(mcaps), "-", dtype=object)
+    for tier, (divisor, fmt) in enumerate(MARKET_CAP_FORMATS):
+        mask = (tiers == tier) & ~np.isnan(mcaps)
+        if mask.any():
+            formatted[mask] = np.char.mod(fmt, mcaps[mask] / divisor)
+    return formatted
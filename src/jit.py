@@ -0,0 +1,22 @@
+# Optional Numba JIT support
+# numba is not a hard dependency: when it is missing, njit() is a no-op and
+# the decorated kernels run as plain Python over NumPy arrays.
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Fallback for numba.njit that returns the function unchanged.
+        Supports both @njit and @njit(cache=True) forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
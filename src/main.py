@@ -1,9 +1,12 @@
 import argparse
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from colorama import Fore, Style, init
 from tabulate import tabulate
@@ -13,6 +16,16 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from src import config, data, strategy
 from src.backtest import BacktestEngine, BacktestReport
+from src.jit import NUMBA_AVAILABLE
+from src.progress import progress
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def parse_args():
@@ -26,6 +39,8 @@ Examples:
   python -m src.main --list lq45        # Show ALL stocks from LQ45 watchlist
   python -m src.main --list idx_liquid  # Show ALL stocks from liquid IDX watchlist
   python -m src.main BBCA BBRI ANTM     # Show specific tickers
+  python -m src.main --refresh          # Refetch stock info instead of using the 24h cache
+  python -m src.main --list lq45 --pretty  # Bordered results table
 
   # Backtesting
   python -m src.main --backtest                               # Backtest default watchlist (2022-2024)
@@ -33,6 +48,7 @@ Examples:
   python -m src.main --backtest BBCA BBRI ANTM               # Backtest specific tickers
   python -m src.main --backtest --start-date 2022-01-01 --end-date 2023-12-31
   python -m src.main --backtest --detailed --charts           # Full analysis with charts
+  python -m src.main --backtest --workers 1                   # Backtest tickers serially
         """,
     )
     parser.add_argument("tickers", nargs="*", help="Specific tickers to scan")
@@ -45,6 +61,16 @@ Examples:
     parser.add_argument(
         "--show-lists", action="store_true", help="Show available watchlists"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Draw the results table with box-drawing borders (tabulate)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached stock info (market cap, sector) and refetch it",
+    )
 
     # Backtesting arguments
     parser.add_argument(
@@ -64,18 +90,135 @@ Examples:
     parser.add_argument(
         "--charts", action="store_true", help="Generate performance charts"
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        help="Processes for per-ticker backtests (default: all CPUs, 1 = serial)",
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    # Normalize CLI tickers once; the scan and backtest paths both reuse them
+    args.tickers = config.normalize_tickers(args.tickers)
+    return args
 
 
 def show_available_lists():
     print(f"{Style.BRIGHT}Available Watchlists:{Style.RESET_ALL}")
-    for f in os.listdir(config.WATCHLISTS_DIR):
-        if f.endswith(".txt"):
-            name = f[:-4]
-            filepath = os.path.join(config.WATCHLISTS_DIR, f)
-            count = len(config.load_watchlist(name))
-            print(f"  {name:15} ({count} stocks)")
+    # scandir yields the file type with each entry, so no extra stat per file;
+    # each file is streamed once just to count its distinct tickers
+    with os.scandir(config.WATCHLISTS_DIR) as entries:
+        for e in entries:
+            if not (e.name.endswith(".txt") and e.is_file()):
+                continue
+            with open(e.path, "r") as f:
+                count = len(
+                    {
+                        t.upper().removesuffix(".JK")
+                        for t in map(str.strip, f)
+                        if t and not t.startswith("#")
+                    }
+                )
+            print(f"  {e.name[:-4]:15} ({count} stocks)")
+
+
+def mcap_filter_mask(tickers, stock_infos):
+    """
+    Boolean mask over tickers: True unless the ticker's known market cap is
+    below MIN_MARKET_CAP (unknown caps pass).
+
+    Market caps are gathered into one float64 array (NaN when unknown) so
+    the threshold is a single vectorized compare.
+    """
+    mcaps = np.array(
+        [(stock_infos.get(t) or {}).get("market_cap") for t in tickers],
+        dtype=np.float64,
+    )
+    return ~(mcaps < config.MIN_MARKET_CAP)
+
+
+def build_results_table(tickers, analyses, mcaps):
+    """
+    Build the scan results table for the given tickers in one pass.
+
+    Args:
+        tickers: Tickers to show, in display order
+        analyses: Mapping ticker -> strategy.analyze_ticker() result
+        mcaps: Market cap per ticker (None when unknown)
+
+    Returns:
+        DataFrame with one formatted string column per table header
+    """
+    # Gather raw scalars column-wise into preallocated buffers in a single
+    # pass; all string formatting happens afterwards, once per column
+    n = len(tickers)
+    price = np.empty(n, dtype=np.float64)
+    rsi = np.empty(n, dtype=np.float64)
+    support = np.empty(n, dtype=np.float64)
+    resistance = np.empty(n, dtype=np.float64)
+    signal = np.empty(n, dtype=object)
+    weekly_trend = np.empty(n, dtype=object)
+    action = np.empty(n, dtype=object)
+    for i, ticker in enumerate(tickers):
+        a = analyses[ticker]
+        price[i] = a["ideal_entry"]
+        rsi[i] = a["rsi"]
+        support[i] = a.get("nearest_support", 0)
+        resistance[i] = a.get("nearest_resistance", 0)
+        signal[i] = a.get("final_signal", a["signal"])
+        weekly_trend[i] = a.get("weekly_trend", "-") or "-"
+        action[i] = a.get("strategy", "HOLD")
+
+    sr_display = np.where(
+        support > 0,
+        np.char.add(
+            np.char.add(np.char.mod("%.0f", support), "/"),
+            np.char.mod("%.0f", resistance),
+        ),
+        "-",
+    )
+
+    return pd.DataFrame(
+        {
+            "Ticker": list(tickers),
+            "Signal": signal,
+            "Price": np.char.mod("%.0f", price),
+            "S/R": sr_display,
+            "RSI": np.char.mod("%.1f", rsi),
+            "W.Trend": weekly_trend,
+            "MCap": data.format_market_cap_array(mcaps),
+            "Strategy": action,
+        },
+        dtype=object,
+    )
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def format_table(results, headers):
+    """
+    Plain-text table in one pass: column widths are measured once and each
+    row is a single f-string join. Columns whose values are all numeric are
+    right-aligned, like tabulate does.
+    """
+    columns = [[str(v) for v in results[h]] for h in headers]
+    widths = [max(len(h), *map(len, col)) for h, col in zip(headers, columns)]
+    align = [">" if all(map(_is_number, col)) else "<" for col in columns]
+
+    lines = [
+        " | ".join(f"{h:{a}{w}}" for h, a, w in zip(headers, align, widths)),
+        "-+-".join("-" * w for w in widths),
+    ]
+    lines.extend(
+        " | ".join(f"{v:{a}{w}}" for v, a, w in zip(row, align, widths))
+        for row in zip(*columns)
+    )
+    return "\n".join(line.rstrip() for line in lines)
 
 
 def save_scan_results(results, headers, scan_mode, market_ctx):
@@ -104,8 +247,10 @@ def save_scan_results(results, headers, scan_mode, market_ctx):
         f.write(f"Strategy: EMA{config.FAST_EMA}/EMA{config.SLOW_EMA} Crossover\n")
         f.write(f"{'=' * 50}\n\n")
 
-        if results:
-            f.write(tabulate(results, headers=headers, tablefmt="simple"))
+        if len(results):
+            f.write(
+                tabulate(results, headers=headers, tablefmt="simple", showindex=False)
+            )
             f.write(f"\n\nTotal: {len(results)} setups found\n")
         else:
             f.write("No setups found matching the criteria.\n")
@@ -121,9 +266,7 @@ def run_backtest(args):
 
     # Determine tickers to backtest
     if args.tickers:
-        tickers_to_test = [
-            t if t.endswith(".JK") else f"{t.upper()}.JK" for t in args.tickers
-        ]
+        tickers_to_test = args.tickers
         test_mode = "Manual Selection"
     elif args.watchlist:
         tickers_to_test = config.load_watchlist(args.watchlist)
@@ -143,12 +286,14 @@ def run_backtest(args):
         end_date=args.end_date or config.BACKTEST_END_DATE,
         initial_cash=config.INITIAL_CAPITAL,
         commission=config.COMMISSION_RATE,
+        workers=args.workers,
     )
 
     print(f"Period: {engine.start_date} to {engine.end_date}")
     print(f"Initial Capital: {engine.initial_cash:,} IDR")
     print(f"Commission: {engine.commission * 100:.1f}% per trade")
     print(f"Risk per Trade: {config.RISK_PER_TRADE * 100:.1f}%")
+    print(f"Workers: {engine.workers}")
     print("-" * 60)
 
     # Run backtest
@@ -162,6 +307,19 @@ def run_backtest(args):
     # Generate report
     report_generator = BacktestReport()
 
+    # Render charts in the background while the text report prints; they
+    # only read the finished results
+    chart_thread = None
+    if args.charts:
+        print(f"\n{Fore.CYAN}Generating performance charts...{Style.RESET_ALL}")
+        chart_path = "backtest_performance.png"
+        chart_thread = threading.Thread(
+            target=report_generator.create_performance_charts,
+            args=(results,),
+            kwargs={"save_path": chart_path},
+        )
+        chart_thread.start()
+
     if args.detailed:
         # Show detailed reports for each ticker
         for ticker, ticker_result in results.get("ticker_results", {}).items():
@@ -173,15 +331,55 @@ def run_backtest(args):
         # Show summary report
         print(report_generator.generate_summary_report(results))
 
-    # Generate charts if requested
-    if args.charts:
-        print(f"\n{Fore.CYAN}Generating performance charts...{Style.RESET_ALL}")
-        chart_path = "backtest_performance.png"
-        report_generator.create_performance_charts(results, save_path=chart_path)
+    # Wait for the chart file to be written before returning
+    if chart_thread is not None:
+        chart_thread.join()
 
     return results
 
 
+def _init_scan_worker():
+    """
+    Process pool initializer: keep native thread pools to one thread, since
+    every worker process already has a core's worth of tickers
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = "1"
+
+
+def _analyze_chunk(items, market_ctx):
+    """
+    Analyze (ticker, df, state) items in order.
+
+    Returns:
+        List of (ticker, analysis, state) tuples
+    """
+    return [
+        (ticker, *strategy.analyze_incremental(df, state, market_ctx=market_ctx))
+        for ticker, df, state in items
+    ]
+
+
+def scan_executor():
+    """
+    Pool for the per-ticker analysis and the number of tickers per task.
+
+    With numba the kernels release the GIL, so threads scale and each
+    ticker is its own task. Without it the NumPy/pandas glue holds the GIL,
+    so tickers go to worker processes in chunks of SCAN_CHUNK_SIZE to
+    amortize pickling.
+    """
+    processes = config.SCAN_PROCESSES
+    if processes is None:
+        processes = 0 if NUMBA_AVAILABLE else os.cpu_count() or 1
+    if processes > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_scan_worker
+        )
+        return executor, config.SCAN_CHUNK_SIZE
+    return ThreadPoolExecutor(max_workers=config.SCAN_WORKERS), 1
+
+
 def main():
     init(autoreset=True)
     args = parse_args()
@@ -197,9 +395,7 @@ def main():
 
     # Original scanning logic
     if args.tickers:
-        tickers_to_scan = [
-            t if t.endswith(".JK") else f"{t.upper()}.JK" for t in args.tickers
-        ]
+        tickers_to_scan = args.tickers
         scan_mode = "Manual Selection"
     elif args.watchlist:
         tickers_to_scan = config.load_watchlist(args.watchlist)
@@ -224,7 +420,7 @@ def main():
     market_ctx = {"market_regime": "UNKNOWN", "risk_on": True}
     if config.ENABLE_MARKET_FILTER:
         print(f"Fetching market data ({config.MARKET_TICKER})...", end="\r")
-        market_df = data.fetch_data(
+        market_df = data.fetch_data_cached(
             config.MARKET_TICKER,
             period=config.MARKET_HISTORY_PERIOD,
             interval=config.MARKET_TIMEFRAME,
@@ -238,97 +434,101 @@ def main():
     )
     print("-" * 60)
 
-    results = []
     skipped_mcap = 0
+    stock_infos = {}
 
-    print(f"{Fore.CYAN}Step 1/3: Fetching historical data...{Style.RESET_ALL}")
+    # Market cap filter: fetch info first so filtered-out tickers never cost
+    # an OHLCV request
+    if config.ENABLE_MCAP_FILTER:
+        print(
+            f"{Fore.CYAN}Step 1/3: Fetching stock info (market cap filter)...{Style.RESET_ALL}"
+        )
+        stock_infos = data.fetch_stock_info_batch(
+            tickers_to_scan, refresh=args.refresh
+        )
+        passed = mcap_filter_mask(tickers_to_scan, stock_infos)
+        skipped_mcap = len(tickers_to_scan) - int(passed.sum())
+        tickers_to_scan = [t for t, ok in zip(tickers_to_scan, passed) if ok]
+        print("-" * 60)
+
+    # Analyze tickers on the scan pool as soon as their batch arrives,
+    # overlapping the strategy work with the downloads still in flight
+    data_step = 2 if config.ENABLE_MCAP_FILTER else 1
+    print(
+        f"{Fore.CYAN}Step {data_step}/3: Fetching and analyzing historical data...{Style.RESET_ALL}"
+    )
+    analyses = {}
+    fetched = set()
+    # Indicator state from the previous scan: tickers whose history only
+    # gained (or updated) its last bar are analyzed in O(1)
+    state_path = os.path.join(data.cache_dir, "strategy_state.pkl")
+    states = strategy.load_states(state_path) if config.INCREMENTAL_ANALYSIS else {}
     try:
-        dfs = data.fetch_data_batch(tickers_to_scan)
+        executor, chunk_size = scan_executor()
+        with executor:
+            futures = []
+            chunk = []
+            for ticker, df in data.fetch_data_batch_iter(tickers_to_scan):
+                fetched.add(ticker)
+                chunk.append((ticker, df, states.get(ticker)))
+                if len(chunk) >= chunk_size:
+                    futures.append(executor.submit(_analyze_chunk, chunk, market_ctx))
+                    chunk = []
+            if chunk:
+                futures.append(executor.submit(_analyze_chunk, chunk, market_ctx))
+            # Progress is drawn only from this thread, as results come in
+            with progress(len(fetched), "Analyzing", unit="ticker") as pbar:
+                for future in as_completed(futures):
+                    results = future.result()
+                    pbar.update(len(results))
+                    for ticker, analysis, state in results:
+                        if analysis:
+                            analyses[ticker] = analysis
+                        if state is not None:
+                            states[ticker] = state
     except Exception as e:
         print(f"{Fore.RED}Batch fetch failed: {e}{Style.RESET_ALL}")
-        dfs = None
-
-    if dfs is None:
         print(f"{Fore.RED}Failed to fetch data. Try again later.{Style.RESET_ALL}")
         return
 
+    if config.INCREMENTAL_ANALYSIS:
+        strategy.save_states(states, state_path)
+
     print("-" * 60)
 
-    # Fetch stock info if needed for filtering or display
-    fetch_stock_info = config.ENABLE_MCAP_FILTER or config.SHOW_MCAP_INFO
-    if fetch_stock_info:
-        purpose = "market cap filter" if config.ENABLE_MCAP_FILTER else "display"
-        print(
-            f"{Fore.CYAN}Step 2/3: Fetching stock info ({purpose})...{Style.RESET_ALL}"
-        )
-        stock_infos = data.fetch_stock_info_batch(list(dfs.keys()))  # Only fetch for successful tickers
+    # Fetch stock info for display only (already fetched when filtering)
+    if config.SHOW_MCAP_INFO and not config.ENABLE_MCAP_FILTER:
+        print(f"{Fore.CYAN}Step 2/3: Fetching stock info (display)...{Style.RESET_ALL}")
+        stock_infos = data.fetch_stock_info_batch(
+            [t for t in tickers_to_scan if t in fetched], refresh=args.refresh
+        )  # Only fetch for successful tickers
         print("-" * 60)
-    else:
-        stock_infos = {}
-
-    print(f"{Fore.CYAN}Step 3/3: Analyzing tickers...{Style.RESET_ALL}")
-    total_tickers = len(tickers_to_scan)
 
-    for idx, ticker in enumerate(tickers_to_scan, 1):
-        print(f"Analyzing {idx}/{total_tickers}: {ticker}...", end="\r")
+    print(f"{Fore.CYAN}Step 3/3: Collecting results...{Style.RESET_ALL}")
 
-        # Get stock info (for display and/or filtering)
-        stock_info = stock_infos.get(ticker)
-        mcap = stock_info.get("market_cap") if stock_info else None
-
-        # Market cap filter (skip small-cap if enabled)
-        if config.ENABLE_MCAP_FILTER:
-            if mcap is not None and mcap < config.MIN_MARKET_CAP:
-                skipped_mcap += 1
-                continue
+    # Show all if --list or specific tickers, otherwise only setups
+    show_all = args.watchlist or args.tickers
+    shown = [
+        ticker
+        for ticker in tickers_to_scan
+        if ticker in analyses and (analyses[ticker]["is_setup"] or show_all)
+    ]
+    mcaps = [
+        (stock_infos.get(ticker) or {}).get("market_cap") or None for ticker in shown
+    ]
+    results = build_results_table(shown, analyses, mcaps)
 
-        df = dfs.get(ticker) if dfs else None
-        if df is not None:
-            analysis = strategy.analyze_ticker(df, market_ctx=market_ctx)
-            if analysis:
-                # Show all if --list or specific tickers, otherwise only setups
-                show_all = args.watchlist or args.tickers
-                if analysis["is_setup"] or show_all:
-                    weekly_trend = analysis.get("weekly_trend", "-") or "-"
-                    final_signal = analysis.get("final_signal", analysis["signal"])
-
-                    inv_strategy = analysis.get("strategy", "HOLD")
-                    support = analysis.get("nearest_support", 0)
-                    resistance = analysis.get("nearest_resistance", 0)
-                    sr_display = (
-                        f"{support:.0f}/{resistance:.0f}" if support > 0 else "-"
-                    )
-                    mcap_display = data.format_market_cap(mcap) if mcap else "-"
-
-                    results.append(
-                        [
-                            ticker,
-                            final_signal,
-                            f"{analysis['ideal_entry']:.0f}",
-                            sr_display,
-                            f"{analysis['rsi']:.1f}",
-                            weekly_trend,
-                            mcap_display,
-                            inv_strategy,
-                        ]
-                    )
-
-    print(" " * 60, end="\r")  # Clear the progress line
     print(f"{Fore.GREEN}Analysis complete!{Style.RESET_ALL}\n")
 
-    headers = [
-        "Ticker",
-        "Signal",
-        "Price",
-        "S/R",
-        "RSI",
-        "W.Trend",
-        "MCap",
-        "Strategy",
-    ]
+    headers = list(results.columns)
 
-    if results:
-        table_output = tabulate(results, headers=headers, tablefmt="fancy_grid")
+    if len(results):
+        if args.pretty:
+            table_output = tabulate(
+                results, headers=headers, tablefmt="fancy_grid", showindex=False
+            )
+        else:
+            table_output = format_table(results, headers)
         print(table_output)
         skip_msg = f" (Skipped {skipped_mcap} small-cap)" if skipped_mcap > 0 else ""
         print(
@@ -1,155 +1,164 @@
 import numpy as np
 import pandas as pd
 
-def _is_doji(row, threshold=0.1):
+from .jit import njit, NUMBA_AVAILABLE
+
+# Pattern flags in output order, paired with their display names
+PATTERN_COLUMNS = [
+    ("is_doji", "Doji"),
+    ("is_hammer", "Hammer"),
+    ("is_shooting_star", "Shooting Star"),
+    ("is_bullish_engulfing", "Bullish Engulfing"),
+    ("is_bearish_engulfing", "Bearish Engulfing"),
+]
+
+def _ohlc_arrays(df, tail=None):
     """
-    Detect Doji: Body is very small relative to the total range.
-    Indecision candle.
+    Pull Open, High, Low, Close out of the DataFrame as float64 arrays.
+
+    Each column is converted on its own (a view for float64 data) and then
+    sliced, so taking the last `tail` bars never builds an intermediate
+    DataFrame or row Series.
     """
-    body = abs(row["Close"] - row["Open"])
-    rng = row["High"] - row["Low"]
-    # Avoid division by zero if range is 0 (flat line)
-    return rng > 0 and body <= (rng * threshold)
+    start = -tail if tail else None
+    return tuple(
+        df[col].to_numpy(dtype=np.float64)[start:]
+        for col in ("Open", "High", "Low", "Close")
+    )
 
-def _is_hammer(row, body_factor=0.3, wick_factor=2.0):
+def _pattern_masks(o, h, l, c, doji_threshold=0.1, body_factor=0.3, wick_factor=2.0):
     """
-    Detect Hammer: Small body, long lower wick, small/no upper wick.
-    Bullish reversal signal (usually found at bottom of downtrend).
+    Evaluate every candlestick pattern over whole OHLC arrays at once.
+
+    Bar i is compared against bar i-1 for the engulfing patterns, so the
+    first bar can never be an engulfing candle.
+
+    Returns:
+        Tuple of boolean arrays in PATTERN_COLUMNS order.
     """
-    body = abs(row["Close"] - row["Open"])
-    rng = row["High"] - row["Low"]
-    lower_wick = min(row["Close"], row["Open"]) - row["Low"]
-    upper_wick = row["High"] - max(row["Close"], row["Open"])
-    
-    if rng == 0:
-        return False
-        
-    return (
-        body <= (rng * body_factor) and
-        lower_wick >= (body * wick_factor) and
-        upper_wick <= body  # Upper wick should be small (length <= body is a reasonable heuristic)
-    )
+    body = np.abs(c - o)
+    rng = h - l
+    lower_wick = np.minimum(c, o) - l
+    upper_wick = h - np.maximum(c, o)
+
+    # Every predicate is plain elementwise arithmetic with no branches;
+    # a zero range (flat line) is never a pattern, so each single-candle
+    # mask is ANDed with has_range instead of guarded by an if.
+    has_range = rng > 0
+    small_body = body <= rng * body_factor
+    long_wick = body * wick_factor
 
-def _is_shooting_star(row, body_factor=0.3, wick_factor=2.0):
+    # Doji: Body is very small relative to the total range (indecision)
+    is_doji = has_range & (body <= rng * doji_threshold)
+
+    # Hammer: Small body, long lower wick, small/no upper wick (bullish reversal)
+    is_hammer = has_range & small_body & (lower_wick >= long_wick) & (upper_wick <= body)
+
+    # Shooting Star: Small body, long upper wick, small/no lower wick (bearish reversal)
+    is_shooting_star = has_range & small_body & (upper_wick >= long_wick) & (lower_wick <= body)
+
+    # Engulfing: compare each candle's color (sign of its body) with the
+    # previous one's
+    color = np.sign(c - o)
+    is_bull_eng = np.zeros(len(c), dtype=bool)
+    is_bear_eng = np.zeros(len(c), dtype=bool)
+
+    # Bullish: RED then GREEN, current body covers previous body
+    # (Prev top is Open, bottom is Close; Curr top is Close, bottom is Open)
+    is_bull_eng[1:] = (color[:-1] < 0) & (color[1:] > 0) & (o[1:] <= c[:-1]) & (c[1:] >= o[:-1])
+
+    # Bearish: GREEN then RED, current body covers previous body
+    # (Prev top is Close, bottom is Open; Curr top is Open, bottom is Close)
+    is_bear_eng[1:] = (color[:-1] > 0) & (color[1:] < 0) & (o[1:] >= c[:-1]) & (c[1:] <= o[:-1])
+
+    return is_doji, is_hammer, is_shooting_star, is_bull_eng, is_bear_eng
+
+@njit(cache=True, nogil=True)
+def _patterns_jit(o, h, l, c, doji_threshold=0.1, body_factor=0.3, wick_factor=2.0):
     """
-    Detect Shooting Star: Small body, long upper wick, small/no lower wick.
-    Bearish reversal signal (usually found at top of uptrend).
+    Single-pass version of _pattern_masks for numba.
+
+    Returns:
+        (n, 5) boolean array, columns in PATTERN_COLUMNS order.
     """
-    body = abs(row["Close"] - row["Open"])
-    rng = row["High"] - row["Low"]
-    lower_wick = min(row["Close"], row["Open"]) - row["Low"]
-    upper_wick = row["High"] - max(row["Close"], row["Open"])
-    
-    if rng == 0:
-        return False
-        
-    return (
-        body <= (rng * body_factor) and
-        upper_wick >= (body * wick_factor) and
-        lower_wick <= body  # Lower wick should be small
-    )
+    n = len(c)
+    out = np.zeros((n, 5), dtype=np.bool_)
+
+    # Same branch-free predicates as _pattern_masks, so the loop body
+    # compiles to straight-line compares that LLVM can vectorize
+    for i in range(n):
+        # Load each price once; ternaries instead of min()/max()
+        oi, hi, li, ci = o[i], h[i], l[i], c[i]
+        body_top, body_bottom = (ci, oi) if ci > oi else (oi, ci)
+        body = body_top - body_bottom
+        rng = hi - li
+        lower_wick = body_bottom - li
+        upper_wick = hi - body_top
+        has_range = rng > 0
+        small_body = body <= rng * body_factor
+        long_wick = body * wick_factor
+
+        out[i, 0] = has_range & (body <= rng * doji_threshold)
+        out[i, 1] = has_range & small_body & (lower_wick >= long_wick) & (upper_wick <= body)
+        out[i, 2] = has_range & small_body & (upper_wick >= long_wick) & (lower_wick <= body)
+
+    for i in range(1, n):
+        prev_color = np.sign(c[i - 1] - o[i - 1])
+        color = np.sign(c[i] - o[i])
+        out[i, 3] = (prev_color < 0) & (color > 0) & (o[i] <= c[i - 1]) & (c[i] >= o[i - 1])
+        out[i, 4] = (prev_color > 0) & (color < 0) & (o[i] >= c[i - 1]) & (c[i] <= o[i - 1])
 
-def _is_bullish_engulfing(curr, prev):
+    return out
+
+def _pattern_table(o, h, l, c):
     """
-    Detect Bullish Engulfing: 
-    - Previous candle is RED (Close < Open)
-    - Current candle is GREEN (Close > Open)
-    - Current body engulfs previous body
+    (n, 5) boolean pattern table for OHLC arrays: the compiled kernel when
+    numba is installed, else the NumPy masks (a plain Python loop over every
+    bar would be slower than the vectorized version).
     """
-    # Check colors
-    prev_is_red = prev["Close"] < prev["Open"]
-    curr_is_green = curr["Close"] > curr["Open"]
-    
-    if not (prev_is_red and curr_is_green):
-        return False
-        
-    # Check engulfing (Current Body covers Previous Body)
-    # Since Prev is Red: Top is Open, Bottom is Close
-    # Since Curr is Green: Top is Close, Bottom is Open
-    return (
-        curr["Open"] <= prev["Close"] and 
-        curr["Close"] >= prev["Open"]
-    )
+    if NUMBA_AVAILABLE:
+        return _patterns_jit(o, h, l, c)
+    return np.column_stack(_pattern_masks(o, h, l, c))
 
-def _is_bearish_engulfing(curr, prev):
+def detect_patterns_series(df):
     """
-    Detect Bearish Engulfing:
-    - Previous candle is GREEN (Close > Open)
-    - Current candle is RED (Close < Open)
-    - Current body engulfs previous body
+    Detect candlestick patterns on every candle in the DataFrame.
+
+    Args:
+        df: DataFrame with Open, High, Low, Close
+
+    Returns:
+        DataFrame on the same index with one boolean column per pattern
+        (is_doji, is_hammer, ...), e.g. for scanning a backtest history.
     """
-    # Check colors
-    prev_is_green = prev["Close"] > prev["Open"]
-    curr_is_red = curr["Close"] < curr["Open"]
-    
-    if not (prev_is_green and curr_is_red):
-        return False
-        
-    # Check engulfing (Current Body covers Previous Body)
-    # Since Prev is Green: Top is Close, Bottom is Open
-    # Since Curr is Red: Top is Open, Bottom is Close
-    return (
-        curr["Open"] >= prev["Close"] and
-        curr["Close"] <= prev["Open"]
+    return pd.DataFrame(
+        _pattern_table(*_ohlc_arrays(df)),
+        index=df.index,
+        columns=[flag for flag, _ in PATTERN_COLUMNS],
     )
 
 def detect_patterns(df):
     """
     Detect candlestick patterns for the latest candle in the DataFrame.
-    
+
     Args:
         df: DataFrame with Open, High, Low, Close
-        
+
     Returns:
         Dictionary with boolean flags and list of pattern names for the last row.
         Example: {'is_doji': True, 'patterns': ['Doji']}
     """
     if df is None or len(df) < 2:
-        return {
-            "patterns": [],
-            "is_doji": False,
-            "is_hammer": False,
-            "is_shooting_star": False,
-            "is_bullish_engulfing": False,
-            "is_bearish_engulfing": False
-        }
-        
-    # Get last two rows
-    curr = df.iloc[-1]
-    prev = df.iloc[-2]
-    
-    patterns = []
-    
-    # 1. Doji
-    is_doji = _is_doji(curr)
-    if is_doji:
-        patterns.append("Doji")
-        
-    # 2. Hammer
-    is_hammer = _is_hammer(curr)
-    if is_hammer:
-        patterns.append("Hammer")
-        
-    # 3. Shooting Star
-    is_shooting_star = _is_shooting_star(curr)
-    if is_shooting_star:
-        patterns.append("Shooting Star")
-        
-    # 4. Bullish Engulfing
-    is_bull_eng = _is_bullish_engulfing(curr, prev)
-    if is_bull_eng:
-        patterns.append("Bullish Engulfing")
-        
-    # 5. Bearish Engulfing
-    is_bear_eng = _is_bearish_engulfing(curr, prev)
-    if is_bear_eng:
-        patterns.append("Bearish Engulfing")
-        
-    return {
-        "patterns": patterns,
-        "is_doji": is_doji,
-        "is_hammer": is_hammer,
-        "is_shooting_star": is_shooting_star,
-        "is_bullish_engulfing": is_bull_eng,
-        "is_bearish_engulfing": is_bear_eng
-    }
+        result = {flag: False for flag, _ in PATTERN_COLUMNS}
+        return {"patterns": [], **result}
+
+    # Only the last two candles matter
+    last = _pattern_table(*_ohlc_arrays(df, tail=2))[-1]
+
+    result = {"patterns": []}
+    for (flag, name), hit in zip(PATTERN_COLUMNS, last.tolist()):
+        result[flag] = hit
+        if hit:
+            result["patterns"].append(name)
+
+    return result
@@ -0,0 +1,79 @@
+# Compile the numba kernels ahead of the first scan
+# Every kernel is @njit(cache=True), so numba writes the machine code to
+# __pycache__ and later processes load it instead of compiling. This runs
+# each scan and backtest path once on synthetic data, so that cache is
+# already populated when a cron job or one-off CLI run starts.
+#
+# Usage: python -m src.precompile
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src import config, strategy
+from src.backtest.engine import BacktestEngine
+from src.backtest.portfolio import Portfolio
+from src.jit import NUMBA_AVAILABLE
+
+WARMUP_BARS = 520  # About two years of daily bars, like HISTORY_PERIOD
+
+
+def synthetic_ohlcv(bars=WARMUP_BARS, seed=0):
+    """
+    Random-walk daily OHLCV frame shaped like the data layer's output.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    spread = close * rng.uniform(0.005, 0.03, bars)
+    return pd.DataFrame(
+        {
+            "Open": close + rng.uniform(-0.5, 0.5, bars) * spread,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(100_000, 10_000_000, bars).astype(np.float64),
+        },
+        index=pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars),
+    )
+
+
+def warm_kernels():
+    """
+    Call every jitted kernel through the code paths main() and the backtester
+    use, so each compiles with the argument types it sees in a real run.
+    """
+    df = synthetic_ohlcv()
+    market_ctx = strategy.analyze_market_regime(df)
+
+    # Scanner: full analysis, then a resumed one with a new bar appended
+    strategy.analyze_ticker(df, market_ctx=market_ctx)
+    _, state = strategy.analyze_incremental(df.iloc[:-1], market_ctx=market_ctx)
+    strategy.analyze_incremental(df, state, market_ctx=market_ctx)
+
+    # Backtester: simulation over precomputed indicators, plus the
+    # portfolio's position sizing and SL/TP scan
+    BacktestEngine(workers=1)._run_single_backtest("WARMUP", df)
+    portfolio = Portfolio(config.INITIAL_CAPITAL)
+    entry = float(df["Close"].iloc[-2])
+    shares = portfolio.calculate_position_size("WARMUP", entry, entry * 0.95, 1e6)
+    portfolio.open_position(
+        "WARMUP", max(shares, 100), entry, entry * 0.95, entry * 1.1, df.index[-2]
+    )
+    portfolio.update_positions({"WARMUP": entry * 0.9}, df.index[-1])
+
+
+def main():
+    if not NUMBA_AVAILABLE:
+        print("numba is not installed; the kernels run as plain Python.")
+        return
+    start = time.perf_counter()
+    warm_kernels()
+    print(f"Compiled numba kernels in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
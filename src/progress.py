@@ -0,0 +1,66 @@
+# Progress bars for long fetch/backtest loops
+# tqdm is not a hard dependency: when it is missing, progress() falls back to
+# a single-line counter that redraws at most every MIN_INTERVAL seconds
+# instead of printing on every update.
+import sys
+import time
+
+try:
+    from tqdm import tqdm
+
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+MIN_INTERVAL = 0.1  # Seconds between redraws of the fallback counter
+
+
+class _LineProgress:
+    """
+    Minimal stand-in for tqdm supporting update(), close() and use as a
+    context manager.
+    """
+
+    def __init__(self, total, desc):
+        self.total = total
+        self.desc = desc
+        self.n = 0
+        self._last_draw = 0.0
+        self._drawn = None
+        self._closed = False
+
+    def update(self, n=1):
+        self.n += n
+        now = time.monotonic()
+        if self.n >= self.total or now - self._last_draw >= MIN_INTERVAL:
+            self._draw()
+            self._last_draw = now
+
+    def _draw(self):
+        self._drawn = self.n
+        sys.stdout.write(f"\r  {self.desc}: {self.n}/{self.total}")
+        sys.stdout.flush()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            if self._drawn != self.n:
+                self._draw()
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def progress(total, desc, unit="it"):
+    """
+    Progress bar over `total` steps: tqdm if installed, else _LineProgress.
+    """
+    if TQDM_AVAILABLE:
+        return tqdm(total=total, desc=desc, unit=unit)
+    return _LineProgress(total, desc)
@@ -1,39 +1,187 @@
 import random
+import threading
 import time
+from collections import deque
 from functools import wraps
 from . import config
 
+# Fraction of the provider's reported request quota below which we pause
+RATE_LIMIT_LOW_WATERMARK = 0.1
+
 
 class CircuitBreakerOpen(Exception):
     pass
 
 
+def is_rate_limit_error(error):
+    error_str = str(error)
+    return "429" in error_str or "Too Many Requests" in error_str
+
+
+def is_throttle_error(error):
+    """True for 429s and 5xx responses, the errors that mean 'back off'."""
+    if is_rate_limit_error(error):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and 500 <= status < 600
+
+
+def get_retry_after(error):
+    """Seconds from a Retry-After header attached to the error's response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    return _parse_seconds(headers.get("Retry-After") or headers.get("retry-after"))
+
+
+def _parse_seconds(value):
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class SlidingWindow:
+    """
+    Sliding-window request scheduler: at most `rpm` requests in any 60 s span.
+    Callers reserve a start time instead of sleeping under a shared lock, so
+    only requests beyond the window's capacity are pushed back.
+    """
+
+    def __init__(self, rpm, period=60.0):
+        self.rpm = rpm
+        self.period = period
+        # Start times of the last `rpm` reserved requests (oldest first)
+        self.q = deque(maxlen=rpm)
+
+    def reserve(self, earliest):
+        """Book the first start time >= earliest that keeps the window under rpm."""
+        slot = max(earliest, self.q[-1]) if self.q else earliest
+        if len(self.q) >= self.rpm:
+            slot = max(slot, self.q[0] + self.period)
+        self.q.append(slot)
+        return slot
+
+
 class RateLimiter:
     def __init__(self):
-        self.last_request_time = 0
+        self.window = SlidingWindow(config.REQUESTS_PER_MINUTE)
         self.consecutive_429 = 0
+        self.pause_until = 0
+        # Shared by all fetch threads: guards the window and pause_until, and
+        # wakes waiting threads when a pause is extended
+        self._cv = threading.Condition()
+        # Separate lock for counters so callers don't queue behind wait()
+        self._state_lock = threading.Lock()
+        # Set once the circuit breaker trips; every waiting or retrying
+        # thread checks it and gives up immediately
+        self._tripped = threading.Event()
+
+    @property
+    def open(self):
+        """True once the circuit breaker has tripped."""
+        return self._tripped.is_set()
+
+    def check_open(self):
+        if self.open:
+            raise CircuitBreakerOpen("Circuit breaker is open. Wait and try again later.")
+
+    def sleep(self, seconds):
+        """time.sleep() that is cut short (raising) when the breaker trips."""
+        if self._tripped.wait(seconds):
+            self.check_open()
 
     def wait(self):
+        self.check_open()
         if not config.ENABLE_RATE_LIMITER:
             return
 
-        delay = random.uniform(config.REQUEST_DELAY_MIN, config.REQUEST_DELAY_MAX)
-        time_since_last_request = time.time() - self.last_request_time
-
-        if time_since_last_request < delay:
-            sleep_time = delay - time_since_last_request
-            time.sleep(sleep_time)
+        with self._cv:
+            slot = self.window.reserve(max(time.monotonic(), self.pause_until))
+            # Condition.wait releases the lock, so other threads can book
+            # their own slots meanwhile; re-check in case pause() moved
+            # pause_until past our slot
+            while True:
+                self.check_open()
+                delay = max(slot, self.pause_until) - time.monotonic()
+                if delay <= 0:
+                    break
+                self._cv.wait(delay)
+
+    def pause(self, seconds):
+        """Hold every caller of wait() for at least `seconds` (e.g. Retry-After)."""
+        with self._cv:
+            self.pause_until = max(self.pause_until, time.monotonic() + seconds)
+            self._cv.notify_all()
+
+    def observe_headers(self, headers):
+        """
+        Pause proactively when the provider reports < 10% of its request quota
+        left (x-ratelimit-* headers), or when it sends Retry-After.
+        """
+        if not headers:
+            return
+        retry_after = _parse_seconds(headers.get("Retry-After") or headers.get("retry-after"))
+        if retry_after is not None:
+            self.pause(retry_after)
 
-        self.last_request_time = time.time()
+        remaining = _parse_seconds(headers.get("x-ratelimit-remaining-requests"))
+        limit = _parse_seconds(headers.get("x-ratelimit-limit-requests"))
+        if remaining is not None and limit and remaining < RATE_LIMIT_LOW_WATERMARK * limit:
+            reset = _parse_seconds(headers.get("x-ratelimit-reset-requests"))
+            self.pause(reset if reset is not None else self.window.period)
 
     def record_success(self):
-        self.consecutive_429 = 0
+        with self._state_lock:
+            self.consecutive_429 = 0
 
     def record_429(self):
-        self.consecutive_429 += 1
-        if self.consecutive_429 >= config.MAX_CONSECUTIVE_429:
+        with self._state_lock:
+            self.consecutive_429 += 1
+            consecutive = self.consecutive_429
+        if consecutive >= config.MAX_CONSECUTIVE_429:
+            self._tripped.set()
+            with self._cv:
+                self._cv.notify_all()
             print(f"Circuit breaker: {config.MAX_CONSECUTIVE_429} consecutive 429 errors. Stopping.")
-            raise CircuitBreakerOpen(f"Too many 429 errors ({self.consecutive_429}). Wait and try again later.")
+            raise CircuitBreakerOpen(f"Too many 429 errors ({consecutive}). Wait and try again later.")
+
+
+class ConcurrencyController:
+    """
+    AIMD limit on in-flight requests: +1 after each success, halved on 429/5xx.
+    Use as a context manager around each request.
+    """
+
+    def __init__(self, initial=None, maximum=None):
+        self.maximum = maximum or config.FETCH_MAX_CONCURRENCY
+        self.limit = min(initial or config.FETCH_INITIAL_CONCURRENCY, self.maximum)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def record_success(self):
+        with self._cond:
+            self.limit = min(self.limit + 1, self.maximum)
+            self._cond.notify_all()
+
+    def record_throttle(self):
+        with self._cond:
+            self.limit = max(self.limit // 2, 1)
 
 
 def retry_with_backoff(max_retries=None, backoff_base=None):
@@ -44,25 +192,40 @@ def retry_with_backoff(max_retries=None, backoff_base=None):
         @wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
+            # Decorrelated jitter: each sleep is drawn from [base, 3 * previous],
+            # so threads that failed together don't all retry together
+            backoff_time = backoff_base
 
             for attempt in range(max_retries + 1):
+                _rate_limiter.check_open()
                 try:
                     result = func(*args, **kwargs)
                     _rate_limiter.record_success()
                     return result
+                except CircuitBreakerOpen:
+                    raise
                 except Exception as e:
                     last_exception = e
-                    error_str = str(e)
 
-                    if "429" in error_str or "Too Many Requests" in error_str:
+                    if is_rate_limit_error(e):
                         _rate_limiter.record_429()
 
                     if attempt == max_retries:
                         raise last_exception
 
-                    backoff_time = backoff_base ** attempt
-                    print(f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. Retrying in {backoff_time}s...")
-                    time.sleep(backoff_time)
+                    response = getattr(e, "response", None)
+                    _rate_limiter.observe_headers(getattr(response, "headers", None))
+
+                    backoff_time = min(
+                        config.RETRY_MAX_SLEEP, random.uniform(backoff_base, backoff_time * 3)
+                    )
+                    sleep_time = backoff_time
+                    retry_after = get_retry_after(e)
+                    if retry_after is not None:
+                        # Server told us when to come back; observe_headers() holds the other threads too
+                        sleep_time = max(sleep_time, retry_after)
+                    print(f"Attempt {attempt + 1}/{max_retries + 1} failed: {e}. Retrying in {sleep_time:.1f}s...")
+                    _rate_limiter.sleep(sleep_time)
 
             if last_exception:
                 raise last_exception
@@ -76,4 +239,3 @@ _rate_limiter = RateLimiter()
 
 def get_rate_limiter():
     return _rate_limiter
-
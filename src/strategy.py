@@ -1,58 +1,357 @@
+import os
+import pickle
+import threading
+from dataclasses import dataclass, replace
+from enum import IntFlag
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 from . import config
 from . import patterns
+from .jit import njit, NUMBA_AVAILABLE
+
+
+def _float_values(series):
+    """
+    Series values as a float array, keeping float32 when the data was cast
+    to it (config.INDICATOR_DTYPE) and using float64 otherwise.
+    """
+    dtype = np.float32 if series.dtype == np.float32 else np.float64
+    return series.to_numpy(dtype=dtype)
+
+
+def rolling_mean(values, window):
+    """
+    Simple moving average over a 1-D array using a strided window view.
+    The first window-1 values are NaN, matching pandas rolling(window).mean().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1 :] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _running_mean(values, window):
+    """
+    Simple moving average in one pass, adding the bar entering the window
+    and subtracting the one leaving it. A window holding a NaN is NaN, as
+    with pandas rolling(window).mean().
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    total = 0.0
+    missing = 0
+    for i in range(n):
+        value = values[i]
+        if np.isnan(value):
+            missing += 1
+        else:
+            total += value
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                missing -= 1
+            else:
+                total -= old
+        if i >= window - 1 and missing == 0:
+            out[i] = total / window
+    return out
+
+
+def volume_average(volume, window):
+    """
+    Rolling mean of volume. Volumes are whole share counts, so the running
+    sum stays exact in float64 and never drifts. Without numba the strided
+    rolling_mean is used instead of looping in Python.
+    """
+    if NUMBA_AVAILABLE:
+        return _running_mean(volume, window)
+    return rolling_mean(volume, window)
+
+
+@njit(cache=True, nogil=True)
+def _ema(values, alpha):
+    """
+    Recursive EMA over a float64 array, same arithmetic as pandas'
+    ewm(alpha=alpha, adjust=False).mean(): NaNs before the first value stay
+    NaN, and a NaN inside the series repeats the previous value while the
+    old weight keeps decaying. (pandas reweights gaps differently for
+    span=3 only; no indicator here uses that span.)
+    """
+    n = len(values)
+    out = np.empty(n, dtype=values.dtype)
+    if n == 0:
+        return out
+
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, n):
+        cur = values[i]
+        is_obs = cur == cur
+        if weighted == weighted:
+            old_wt *= old_wt_factor
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def _span_alpha(period):
+    """
+    EMA smoothing factor for span=period, same rounding as pandas.
+    """
+    return 1.0 / (1.0 + (period - 1) / 2.0)
+
+
+@lru_cache(maxsize=8)
+def _alphas_for(
+    fast, slow, macd_fast, macd_slow, macd_signal, weekly_fast, weekly_slow
+):
+    return {
+        "fast": _span_alpha(fast),
+        "slow": _span_alpha(slow),
+        "macd_fast": _span_alpha(macd_fast),
+        "macd_slow": _span_alpha(macd_slow),
+        "macd_signal": _span_alpha(macd_signal),
+        "weekly_fast": _span_alpha(weekly_fast),
+        "weekly_slow": _span_alpha(weekly_slow),
+    }
+
+
+def _config_alphas():
+    """
+    EMA alphas for the configured periods. They are the same for every
+    ticker in a run, so they are computed once per set of periods (the
+    cache key follows config, so changed settings still take effect).
+    """
+    return _alphas_for(
+        config.FAST_EMA,
+        config.SLOW_EMA,
+        config.MACD_FAST,
+        config.MACD_SLOW,
+        config.MACD_SIGNAL,
+        config.WEEKLY_FAST_EMA,
+        config.WEEKLY_SLOW_EMA,
+    )
+
+
+@lru_cache(maxsize=8)
+def _target_profit_range(target_min, target_max):
+    """
+    Display string for the profit target range, e.g. "3-10%".
+    """
+    return f"{target_min * 100:.0f}-{target_max * 100:.0f}%"
+
+
+@njit(cache=True, nogil=True)
+def _ema_step(prev, value, alpha):
+    """
+    One step of _ema() for a new observed value; prev is NaN before the
+    first value.
+    """
+    if prev != prev:
+        return value
+    if prev == value:
+        return prev
+    old_wt = 1.0 - alpha
+    return (old_wt * prev + alpha * value) / (old_wt + alpha)
 
 
 def calculate_ema(series, period):
-    return series.ewm(span=period, adjust=False).mean()
+    """
+    Exponential moving average with span=period (pandas adjust=False form).
+    """
+    alpha = _span_alpha(period)
+    return pd.Series(_ema(_float_values(series), alpha), index=series.index)
 
 
-def calculate_rsi(series, period=14):
+@lru_cache(maxsize=32)
+def _ema_powers(period):
     """
-    Calculate RSI using Wilder's Smoothing Method.
+    Decay powers (1 - alpha)**k, newest bar first, for span=period.
+
+    The table stops once the powers fall below float64 resolution, so bars
+    further back cannot change an EMA value and a dot product over the
+    last len(table) bars reproduces the recursive EMA to rounding.
+    """
+    alpha = _span_alpha(period)
+    eps = np.finfo(np.float64).eps / 4
+    size = int(np.ceil(np.log(eps) / np.log1p(-alpha))) + 1
+    return (1.0 - alpha) ** np.arange(size)
+
+
+def ema_tail(values, period, bars=1):
+    """
+    Last `bars` values of calculate_ema() as dot products with a cached
+    weight table instead of a pass over the whole history.
+
+    Args:
+        values: 1-D array of observations (no NaN in the used tail)
+        period: EMA span
+        bars: Number of trailing EMA values to return
+
+    Returns:
+        float64 array of length min(bars, len(values))
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    alpha = _span_alpha(period)
+    powers = _ema_powers(period)
+
+    if np.isnan(values[-(len(powers) + bars) :]).any():
+        # Gaps are reweighted by the recursive form; keep its exact semantics
+        return _ema(values, alpha)[-bars:]
+
+    out = np.empty(min(bars, n))
+    for i, end in enumerate(range(n - len(out), n)):
+        start = max(0, end + 1 - len(powers))
+        window = values[start : end + 1][::-1]
+        value = alpha * np.dot(powers[: len(window)], window)
+        if start == 0:
+            # The first observation seeds the EMA with weight (1-a)^t, not
+            # a * (1-a)^t
+            value += (1.0 - alpha) * powers[end] * values[0]
+        out[i] = value
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _wilder_smooth(avg, values, period):
+    """
+    Wilder's smoothing in place: avg[i] = (avg[i-1] * (period - 1) + values[i]) / period
+    for every bar after the seed value at avg[period - 1].
+    """
+    for i in range(period, len(values)):
+        avg[i] = (avg[i - 1] * (period - 1) + values[i]) / period
+    return avg
+
+
+def _rsi_averages(series, period):
+    """
+    Wilder-smoothed average gain and loss arrays behind calculate_rsi().
     """
     delta = series.diff()
     gain = delta.where(delta > 0, 0)
     loss = -delta.where(delta < 0, 0)
 
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
+    # Seed with a simple average, then run the recurrence on raw arrays
+    avg_gain = _wilder_smooth(
+        gain.rolling(window=period).mean().to_numpy(dtype=np.float64, copy=True),
+        gain.to_numpy(dtype=np.float64),
+        period,
+    )
+    avg_loss = _wilder_smooth(
+        loss.rolling(window=period).mean().to_numpy(dtype=np.float64, copy=True),
+        loss.to_numpy(dtype=np.float64),
+        period,
+    )
+    return avg_gain, avg_loss
 
-    # Wilder's smoothing
-    for i in range(period, len(series)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (period - 1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (period - 1) + loss.iloc[i]) / period
 
+def calculate_rsi(series, period=14):
+    """
+    Calculate RSI using Wilder's Smoothing Method.
+    """
+    avg_gain, avg_loss = _rsi_averages(series, period)
     rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return pd.Series(100 - (100 / (1 + rs)), index=series.index)
+
+
+@njit(cache=True, nogil=True)
+def _ewm_update(weighted, old_wt, cur, alpha):
+    """
+    One step of _ema()'s recurrence; returns the new (weighted, old_wt).
+    """
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif cur == cur:
+        weighted = cur
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def _macd(values, a_fast, a_slow, a_signal):
+    """
+    MACD line and signal line in one pass: the fast, slow and signal EMAs
+    advance side by side over the same input, with _ema()'s arithmetic and
+    output rounding, so the result matches three separate EMA passes.
+    """
+    n = len(values)
+    ema_fast = np.empty(n, dtype=values.dtype)
+    ema_slow = np.empty(n, dtype=values.dtype)
+    macd_line = np.empty(n, dtype=values.dtype)
+    signal_line = np.empty(n, dtype=values.dtype)
+    if n == 0:
+        return macd_line, signal_line
+
+    fast, fast_wt = values[0], 1.0
+    slow, slow_wt = values[0], 1.0
+    ema_fast[0] = fast
+    ema_slow[0] = slow
+    macd_line[0] = ema_fast[0] - ema_slow[0]
+    signal, signal_wt = macd_line[0], 1.0
+    signal_line[0] = signal
+    for i in range(1, n):
+        fast, fast_wt = _ewm_update(fast, fast_wt, values[i], a_fast)
+        slow, slow_wt = _ewm_update(slow, slow_wt, values[i], a_slow)
+        ema_fast[i] = fast
+        ema_slow[i] = slow
+        macd_line[i] = ema_fast[i] - ema_slow[i]
+        signal, signal_wt = _ewm_update(signal, signal_wt, macd_line[i], a_signal)
+        signal_line[i] = signal
+    return macd_line, signal_line
 
 
 def calculate_macd(series, fast=12, slow=26, signal=9):
-    ema_fast = calculate_ema(series, fast)
-    ema_slow = calculate_ema(series, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
+    macd_line, signal_line = _macd(
+        _float_values(series), _span_alpha(fast), _span_alpha(slow), _span_alpha(signal)
+    )
     histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    return (
+        pd.Series(macd_line, index=series.index),
+        pd.Series(signal_line, index=series.index),
+        pd.Series(histogram, index=series.index),
+    )
 
 
-def calculate_atr(df, period=14):
+def _true_range(df):
     """
-    Calculate Average True Range (ATR).
+    True range per bar as an array.
     """
-    high = df["High"]
-    low = df["Low"]
-    close = df["Close"].shift(1)
+    high = _float_values(df["High"])
+    low = _float_values(df["Low"])
+    prev_close = np.empty_like(high)
+    prev_close[:1] = np.nan
+    prev_close[1:] = _float_values(df["Close"])[:-1]
+
+    # Elementwise max of the three ranges; fmax skips the missing previous
+    # close on the first bar like pandas' row max did
+    return np.fmax(
+        np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close)
+    )
 
-    tr1 = high - low
-    tr2 = (high - close).abs()
-    tr3 = (low - close).abs()
 
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
-    return atr
+def calculate_atr(df, period=14):
+    """
+    Calculate Average True Range (ATR).
+    """
+    atr = rolling_mean(_true_range(df), period)
+    return pd.Series(atr, index=df.index)
 
 
 def calculate_pivot_points(df):
@@ -63,10 +362,10 @@ def calculate_pivot_points(df):
     if len(df) < 2:
         return None
 
-    prev = df.iloc[-2]
-    high = float(prev["High"])
-    low = float(prev["Low"])
-    close = float(prev["Close"])
+    # Scalar reads per column; df.iloc[-2] would build a row Series
+    high = float(df["High"].iat[-2])
+    low = float(df["Low"].iat[-2])
+    close = float(df["Close"].iat[-2])
 
     pivot = (high + low + close) / 3
     r1 = (2 * pivot) - low
@@ -84,19 +383,18 @@ def find_swing_levels(df, lookback=20):
     if len(df) < lookback:
         return None
 
-    recent = df.tail(lookback)
-
-    swing_high = float(recent["High"].max())
-    swing_low = float(recent["Low"].min())
-
-    high_idx = recent["High"].idxmax()
-    low_idx = recent["Low"].idxmin()
+    # Views of the last `lookback` bars; one arg-reduction each gives both
+    # the level and its position (NaNs skipped, like idxmax/idxmin)
+    high = df["High"].to_numpy()[-lookback:]
+    low = df["Low"].to_numpy()[-lookback:]
+    high_pos = int(np.nanargmax(high))
+    low_pos = int(np.nanargmin(low))
 
     return {
-        "swing_high": swing_high,
-        "swing_low": swing_low,
-        "high_date": high_idx,
-        "low_date": low_idx,
+        "swing_high": float(high[high_pos]),
+        "swing_low": float(low[low_pos]),
+        "high_date": df.index[len(df) - lookback + high_pos],
+        "low_date": df.index[len(df) - lookback + low_pos],
     }
 
 
@@ -105,7 +403,8 @@ def analyze_support_resistance(current_price, pivot_data, swing_data):
     Analyze price position relative to support/resistance levels.
     Returns recommendation based on S/R levels.
     """
-    if not pivot_data or not swing_data:
+    # Distances are relative to the price, so a zero price has none
+    if not pivot_data or not swing_data or not current_price > 0:
         return {
             "sr_signal": "NEUTRAL",
             "nearest_support": 0,
@@ -149,7 +448,7 @@ def analyze_support_resistance(current_price, pivot_data, swing_data):
     risk_reward = (
         resistance_distance_pct / support_distance_pct
         if support_distance_pct > 0
-        else 0
+        else 0.0
     )
     if risk_reward > 2:
         sr_score += 1
@@ -167,22 +466,73 @@ def analyze_support_resistance(current_price, pivot_data, swing_data):
     }
 
 
+def _first_last_valid(values, starts, ends, last):
+    """
+    First (or last) non-NaN value of each [start, end) group; NaN when a
+    group has none.
+    """
+    if values.dtype.kind != "f":
+        return values[ends - 1] if last else values[starts]
+    pos = np.arange(len(values))
+    valid = ~np.isnan(values)
+    if last:
+        picked = np.maximum.reduceat(np.where(valid, pos, -1), starts)
+        found = picked >= starts
+    else:
+        picked = np.minimum.reduceat(np.where(valid, pos, len(values)), starts)
+        found = picked < ends
+    return np.where(found, values[np.where(found, picked, 0)], np.nan)
+
+
 def to_weekly(df_daily):
     """
-    Resample daily OHLCV to weekly candles.
+    Resample daily OHLCV to weekly candles (weeks ending Friday, labelled
+    by that Friday like resample("W-FRI")).
+
+    Bars are grouped by an integer week id computed from the day numbers,
+    and each column is reduced per week with ufunc.reduceat instead of
+    going through pandas' resampler.
     """
-    df = df_daily.copy()
-    df.index = pd.to_datetime(df.index)
+    index = pd.DatetimeIndex(pd.to_datetime(df_daily.index))
+    if len(index) == 0:
+        return df_daily[["Open", "High", "Low", "Close", "Volume"]].iloc[:0]
+    if not index.is_monotonic_increasing:
+        order = np.argsort(index, kind="stable")
+        df_daily, index = df_daily.iloc[order], index[order]
+
+    # Day number of each bar in local wall time; 1970-01-01 was a Thursday,
+    # so (1 - day) % 7 days ahead is the week's Friday
+    day = index.tz_localize(None).to_numpy().astype("datetime64[D]").astype(np.int64)
+    week_end = day + (1 - day) % 7
+    starts = np.flatnonzero(np.r_[True, week_end[1:] != week_end[:-1]])
+    ends = np.r_[starts[1:], len(day)]
+
+    columns = {}
+    for col, how in (
+        ("Open", "first"),
+        ("High", "max"),
+        ("Low", "min"),
+        ("Close", "last"),
+        ("Volume", "sum"),
+    ):
+        values = df_daily[col].to_numpy()
+        if how in ("first", "last"):
+            columns[col] = _first_last_valid(values, starts, ends, how == "last")
+        elif how == "sum":
+            if values.dtype.kind == "f":
+                values = np.where(np.isnan(values), 0, values)
+            columns[col] = np.add.reduceat(values, starts)
+        else:
+            reduce = np.fmax if how == "max" else np.fmin
+            columns[col] = reduce.reduceat(values, starts)
 
-    weekly = df.resample("W-FRI").agg(
-        {
-            "Open": "first",
-            "High": "max",
-            "Low": "min",
-            "Close": "last",
-            "Volume": "sum",
-        }
+    labels = pd.DatetimeIndex(
+        week_end[starts].astype("datetime64[D]").astype(index.dtype.base),
+        name=index.name,
     )
+    if index.tz is not None:
+        labels = labels.tz_localize(index.tz)
+    weekly = pd.DataFrame(columns, index=labels)
     return weekly.dropna(subset=["Close"])
 
 
@@ -193,11 +543,11 @@ def analyze_weekly_trend(df_weekly):
     if df_weekly is None or len(df_weekly) < config.WEEKLY_SLOW_EMA + 5:
         return {"weekly_trend": "UNKNOWN", "weekly_aligned": True}
 
-    close = df_weekly["Close"]
-    ema_fast = calculate_ema(close, config.WEEKLY_FAST_EMA)
-    ema_slow = calculate_ema(close, config.WEEKLY_SLOW_EMA)
+    close = _float_values(df_weekly["Close"])
+    ema_fast = ema_tail(close, config.WEEKLY_FAST_EMA)
+    ema_slow = ema_tail(close, config.WEEKLY_SLOW_EMA)
 
-    aligned = bool(ema_fast.iloc[-1] > ema_slow.iloc[-1])
+    aligned = bool(ema_fast[-1] > ema_slow[-1])
     trend = "UP" if aligned else "DOWN"
     return {"weekly_trend": trend, "weekly_aligned": aligned}
 
@@ -209,25 +559,83 @@ def analyze_market_regime(df_market):
     if df_market is None or len(df_market) < config.MARKET_SLOW_EMA + 5:
         return {"market_regime": "UNKNOWN", "risk_on": True}
 
-    if isinstance(df_market.columns, pd.MultiIndex):
-        df_market.columns = df_market.columns.get_level_values(0)
+    # Read Close by position rather than relabeling the caller's frame
+    columns = df_market.columns
+    if isinstance(columns, pd.MultiIndex):
+        columns = columns.get_level_values(0)
 
-    close = df_market["Close"]
-    ema_fast = calculate_ema(close, config.MARKET_FAST_EMA)
-    ema_slow = calculate_ema(close, config.MARKET_SLOW_EMA)
+    close = _float_values(df_market.iloc[:, columns.get_loc("Close")])
+    ema_fast = ema_tail(close, config.MARKET_FAST_EMA)
+    ema_slow = ema_tail(close, config.MARKET_SLOW_EMA)
 
-    risk_on = bool(ema_fast.iloc[-1] > ema_slow.iloc[-1])
+    risk_on = bool(ema_fast[-1] > ema_slow[-1])
     regime = "RISK_ON" if risk_on else "RISK_OFF"
     return {"market_regime": regime, "risk_on": risk_on}
 
 
+class SignalFlag(IntFlag):
+    """
+    Keywords of a signal label as bits, so scoring tests integer masks
+    instead of searching strings. The labels themselves stay strings for
+    display.
+    """
+
+    BUY = 1
+    STRONG = 2
+    WEAK = 4
+    WAIT = 8
+    UPTREND = 16
+    DOWNTREND = 32
+
+
+@lru_cache(maxsize=256)
+def signal_flags(signal, final_signal=None):
+    """
+    SignalFlag bits of an analysis, as the scoring reads them: BUY, STRONG,
+    WEAK and WAIT from the final signal, UPTREND and DOWNTREND from the
+    daily signal. There are only a handful of distinct labels, so the
+    result is cached per label pair.
+    """
+    if final_signal is None:
+        final_signal = signal
+    flags = SignalFlag(0)
+    for flag in (SignalFlag.BUY, SignalFlag.STRONG, SignalFlag.WEAK, SignalFlag.WAIT):
+        if flag.name in final_signal:
+            flags |= flag
+    for flag in (SignalFlag.UPTREND, SignalFlag.DOWNTREND):
+        if flag.name in signal:
+            flags |= flag
+    return flags
+
+
+@lru_cache(maxsize=64)
+def _signal_score(flags):
+    """
+    Score of a signal: a BUY (not WAIT) scores 3, +2 when STRONG, -1 when
+    WEAK; otherwise an uptrend scores 1 and a downtrend -2. Flags take few
+    distinct values, so the enum arithmetic runs once per value.
+    """
+    if flags & SignalFlag.BUY and not flags & SignalFlag.WAIT:
+        if flags & SignalFlag.STRONG:
+            return 5
+        if flags & SignalFlag.WEAK:
+            return 2
+        return 3
+    if flags & SignalFlag.UPTREND:
+        return 1
+    if flags & SignalFlag.DOWNTREND:
+        return -2
+    return 0
+
+
 def get_investment_strategy(analysis, weekly_ctx, market_ctx):
     """
     Determine investment strategy based on multiple factors.
     Returns: BUY ALL, BUY PARTIAL, HOLD, SELL PARTIAL, SELL ALL
     """
-    signal = analysis.get("signal", "")
-    final_signal = analysis.get("final_signal", signal)
+    flags = analysis.get("signal_flags")
+    if flags is None:
+        flags = signal_flags(analysis.get("signal", ""), analysis.get("final_signal"))
     rsi = analysis.get("rsi", 50)
     vol_ratio = analysis.get("vol_ratio", 1.0)
     weekly_aligned = weekly_ctx.get("weekly_aligned", True)
@@ -238,20 +646,7 @@ def get_investment_strategy(analysis, weekly_ctx, market_ctx):
     rsi_slope = analysis.get("rsi_slope", 0)
     ema_spread_slope = analysis.get("ema_spread_slope", 0)
 
-    score = 0
-
-    if "BUY" in final_signal and "WAIT" not in final_signal:
-        score += 3
-        if "STRONG" in final_signal:
-            score += 2
-        elif "WEAK" in final_signal:
-            score -= 1
-    elif "UPTREND" in signal:
-        score += 1
-    elif "DOWNTREND" in signal:
-        score -= 2
-    elif "WAIT" in final_signal:
-        score += 0
+    score = _signal_score(flags)
 
     if weekly_aligned:
         score += 1
@@ -334,16 +729,11 @@ def combine_signals(base_analysis, weekly_ctx, market_ctx):
     score = 0
 
     if original_signal == "BUY":
-        score += 2
+        score += 2 + int(weekly_ok) + int(risk_on)
 
-        if weekly_ok:
-            score += 1
-        else:
+        if not weekly_ok:
             context_reasons.append("Weekly misaligned")
-
-        if risk_on:
-            score += 1
-        else:
+        if not risk_on:
             context_reasons.append("Market risk-off")
 
         if config.ENABLE_MTF and config.MTF_REQUIRED_FOR_BUY and not weekly_ok:
@@ -367,6 +757,7 @@ def combine_signals(base_analysis, weekly_ctx, market_ctx):
     base_analysis.update(
         {
             "final_signal": final_signal,
+            "signal_flags": signal_flags(original_signal, final_signal),
             "score": score,
             "weekly_trend": weekly_ctx.get("weekly_trend"),
             "market_regime": (market_ctx or {}).get("market_regime"),
@@ -380,82 +771,312 @@ def combine_signals(base_analysis, weekly_ctx, market_ctx):
     return base_analysis
 
 
-def analyze_ticker(df, market_ctx=None):
+# Bars read back for swing highs/lows (and pivots/patterns, which need fewer)
+SWING_LOOKBACK = 20
+
+
+def min_history_bars():
     """
-    Applies the swing trading strategy to the dataframe.
+    Minimum number of daily bars needed before indicators are meaningful.
     """
-    if df is None or len(df) < max(
-        config.SLOW_EMA, config.MACD_SLOW + config.MACD_SIGNAL, config.ATR_PERIOD
-    ):
-        return None
+    return max(config.SLOW_EMA, config.MACD_SLOW + config.MACD_SIGNAL, config.ATR_PERIOD)
 
-    # Create a copy to avoid SettingWithCopyWarning
-    df = df.copy()
 
-    # Handle yfinance multi-index if necessary
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(1)
+def prepare_ohlcv(df):
+    """
+    df with flat title-case OHLCV columns, numeric values and no rows
+    missing a Close.
+
+    The caller's frame is never written to, and a new frame is only built
+    by the steps that actually change something: clean data (what the data
+    layer returns) comes back as df itself, with no copy.
+    """
+    columns = df.columns
 
+    # Handle yfinance multi-index if necessary
+    if isinstance(columns, pd.MultiIndex):
+        columns = columns.get_level_values(1)
     # Handle case where columns might still be tuples
-    if df.columns.size > 0 and isinstance(df.columns[0], tuple):
-        df.columns = [col[1] if isinstance(col, tuple) else col for col in df.columns]
+    elif columns.size > 0 and isinstance(columns[0], tuple):
+        columns = [col[1] if isinstance(col, tuple) else col for col in columns]
 
     # Normalize column names to title case (auto_adjust=True makes them lowercase)
-    df.columns = [col.title() if isinstance(col, str) else col for col in df.columns]
+    columns = [col.title() if isinstance(col, str) else col for col in columns]
+    if columns != df.columns.tolist():
+        df = df.set_axis(columns, axis=1)
+
+    # Convert OHLCV to numeric. yfinance data is already numeric, so the
+    # coercion only runs for frames that need it
+    ohlcv = ["Open", "High", "Low", "Close", "Volume"]
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in ohlcv):
+        df = df.assign(
+            **{col: pd.to_numeric(df[col], errors="coerce") for col in ohlcv}
+        )
 
-    # Convert all columns to numeric and handle potential NaNs
-    for col in ["Close", "Open", "High", "Low", "Volume"]:
-        df.loc[:, col] = pd.to_numeric(df[col], errors="coerce")
+    # Optionally narrow OHLCV once here so the indicator math runs in float32
+    if config.INDICATOR_DTYPE != "float64":
+        df = df.astype(dict.fromkeys(ohlcv, config.INDICATOR_DTYPE))
 
-    df = df.dropna(subset=["Close"])
-    close = df["Close"]
-    volume = df["Volume"]
+    # Drop rows without a Close; most frames have none, so skip the copy
+    missing = df["Close"].isna().to_numpy()
+    return df[~missing] if missing.any() else df
+
+
+def indicator_arrays(df):
+    """
+    Every indicator and per-bar signal as plain NumPy arrays, keyed by the
+    column names precompute_indicators() uses.
+
+    Args:
+        df: Frame returned by prepare_ohlcv()
+
+    Returns:
+        Dictionary of column name -> array aligned with df's rows
+    """
+    close_s = df["Close"]
+    close = _float_values(close_s)
+    volume = _float_values(df["Volume"])
 
     # Calculate Indicators
-    df.loc[:, "EMA_Fast"] = calculate_ema(close, config.FAST_EMA)
-    df.loc[:, "EMA_Slow"] = calculate_ema(close, config.SLOW_EMA)
-    df.loc[:, "RSI"] = calculate_rsi(close, config.RSI_PERIOD)
-    df.loc[:, "ATR"] = calculate_atr(df, config.ATR_PERIOD)
+    ema_fast = calculate_ema(close_s, config.FAST_EMA).to_numpy()
+    ema_slow = calculate_ema(close_s, config.SLOW_EMA).to_numpy()
+    rsi = calculate_rsi(close_s, config.RSI_PERIOD).to_numpy()
+    atr = calculate_atr(df, config.ATR_PERIOD).to_numpy()
+    macd_line, signal_line = _macd(
+        close,
+        _span_alpha(config.MACD_FAST),
+        _span_alpha(config.MACD_SLOW),
+        _span_alpha(config.MACD_SIGNAL),
+    )
+    hist = macd_line - signal_line
+
+    vol_avg = volume_average(volume, config.VOL_AVG_PERIOD)
+
+    return {
+        "EMA_Fast": ema_fast,
+        "EMA_Slow": ema_slow,
+        "RSI": rsi,
+        "ATR": atr,
+        "MACD": macd_line,
+        "MACD_Signal": signal_line,
+        "MACD_Hist": hist,
+        "Vol_Avg": vol_avg,
+        **_signal_columns(close, volume, ema_fast, ema_slow, atr, vol_avg),
+    }
+
+
+def _signal_columns(close, volume, ema_fast, ema_slow, atr, vol_avg):
+    """
+    Per-bar signal arrays derived from the indicators: volume ratio,
+    crossover setup and SL/TP levels.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_ratio = np.where(vol_avg > 0, volume / vol_avg, 0.0)
+
+    # Primary Signal: Golden Cross (fast EMA crosses above slow EMA)
+    above = ema_fast > ema_slow
+    prev_not_above = np.zeros(len(close), dtype=bool)
+    prev_not_above[1:] = ema_fast[:-1] <= ema_slow[:-1]
+
+    # Target SL/TP levels (used for BUY setups and UPTREND reference)
+    stop_loss = close - (atr * config.ATR_MULTIPLIER)
+    # Sanity check for SL
+    stop_loss = np.where(
+        stop_loss > close, close * (1 - config.STOP_LOSS_PCT), stop_loss
+    )
+
+    return {
+        "Vol_Ratio": vol_ratio,
+        "Is_Setup": above & prev_not_above,
+        "Stop_Loss": stop_loss,
+        "Take_Profit_Min": close * (1 + config.TARGET_PROFIT_MIN),
+        "Take_Profit_Max": close * (1 + config.TARGET_PROFIT_MAX),
+    }
+
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def _recurrence_tail(close, bars, a_fast, a_slow, a_macd_fast, a_macd_slow,
+                     a_macd_signal, rsi_period):
+    """
+    Run every recursive indicator over close in one pass, keeping only the
+    values of the last `bars` bars.
+
+    Returns:
+        (bars, 7) float64 array with columns EMA_Fast, EMA_Slow, MACD fast
+        EMA, MACD slow EMA, MACD_Signal, RSI average gain, RSI average loss
+    """
+    n = len(close)
+    out = np.full((bars, 7), np.nan)
+    ema_fast = ema_slow = macd_fast = macd_slow = macd_signal = np.nan
+    avg_gain = avg_loss = np.nan
+    # Compensated sums for the RSI seed, as in pandas' rolling mean
+    gain_sum = gain_comp = loss_sum = loss_comp = 0.0
+
+    for i in range(n):
+        c = close[i]
+        ema_fast = _ema_step(ema_fast, c, a_fast)
+        ema_slow = _ema_step(ema_slow, c, a_slow)
+        macd_fast = _ema_step(macd_fast, c, a_macd_fast)
+        macd_slow = _ema_step(macd_slow, c, a_macd_slow)
+        macd_signal = _ema_step(macd_signal, macd_fast - macd_slow, a_macd_signal)
+
+        gain = loss = 0.0
+        if i > 0:
+            delta = c - close[i - 1]
+            if delta > 0:
+                gain = delta
+            elif delta < 0:
+                loss = -delta
+
+        if i < rsi_period:
+            y = gain - gain_comp
+            t = gain_sum + y
+            gain_comp = t - gain_sum - y
+            gain_sum = t
+            y = loss - loss_comp
+            t = loss_sum + y
+            loss_comp = t - loss_sum - y
+            loss_sum = t
+            if i == rsi_period - 1:
+                avg_gain = gain_sum / rsi_period
+                avg_loss = loss_sum / rsi_period
+        else:
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+
+        row = i - (n - bars)
+        if row >= 0:
+            out[row, 0] = ema_fast
+            out[row, 1] = ema_slow
+            out[row, 2] = macd_fast
+            out[row, 3] = macd_slow
+            out[row, 4] = macd_signal
+            out[row, 5] = avg_gain
+            out[row, 6] = avg_loss
+    return out
+
+
+def _indicator_tail(df, bars=2):
+    """
+    indicator_arrays() for just the last `bars` bars, in O(1) memory.
 
-    macd_line, signal_line, hist = calculate_macd(
-        close, config.MACD_FAST, config.MACD_SLOW, config.MACD_SIGNAL
+    The recursive indicators come from one _recurrence_tail() pass; the
+    window averages (ATR, volume) only need their last windows, so they
+    are computed from short slices with the same functions as the full path.
+
+    Returns:
+        Tuple of (indicators, recurrences): indicator name -> array of the
+        last `bars` values (the indicator_arrays() keys plus Close), and the
+        MACD EMAs and RSI averages on the last bar for a StrategyState
+    """
+    # One extra bar so the first returned bar can test for a crossover
+    k = min(bars + 1, len(df))
+    close = _float_values(df["Close"])[-k:]
+    alphas = _config_alphas()
+    rec = _recurrence_tail(
+        _float_values(df["Close"]),
+        k,
+        alphas["fast"],
+        alphas["slow"],
+        alphas["macd_fast"],
+        alphas["macd_slow"],
+        alphas["macd_signal"],
+        config.RSI_PERIOD,
     )
-    df.loc[:, "MACD"] = macd_line
-    df.loc[:, "MACD_Signal"] = signal_line
-    df.loc[:, "MACD_Hist"] = hist
+    ema_fast, ema_slow, macd_fast, macd_slow, signal_line, avg_gain, avg_loss = rec.T
+    macd_line = macd_fast - macd_slow
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # Slices start one bar early so the first true range has its prev close
+    atr = rolling_mean(
+        _true_range(df.iloc[-(k + config.ATR_PERIOD) :]), config.ATR_PERIOD
+    )[-k:]
+    volume = _float_values(df["Volume"])[-(k + config.VOL_AVG_PERIOD - 1) :]
+    vol_avg = volume_average(volume, config.VOL_AVG_PERIOD)[-k:]
+
+    indicators = {
+        "EMA_Fast": ema_fast,
+        "EMA_Slow": ema_slow,
+        "RSI": rsi,
+        "ATR": atr,
+        "MACD": macd_line,
+        "MACD_Signal": signal_line,
+        "MACD_Hist": macd_line - signal_line,
+        "Vol_Avg": vol_avg,
+        **_signal_columns(close, volume[-k:], ema_fast, ema_slow, atr, vol_avg),
+        "Close": close,
+    }
+    recurrences = {
+        "macd_fast": float(macd_fast[-1]),
+        "macd_slow": float(macd_slow[-1]),
+        "avg_gain": float(avg_gain[-1]),
+        "avg_loss": float(avg_loss[-1]),
+    }
+    return {name: values[-bars:] for name, values in indicators.items()}, recurrences
+
+
+def precompute_indicators(df):
+    """
+    Compute every indicator and per-bar signal column over the full history.
+
+    All indicators are causal (value at bar i only depends on bars <= i), so
+    row i of the result matches what analyze_ticker would see on df[:i+1].
+    Used by the backtester to avoid re-analyzing an expanding slice per bar.
+    """
+    df = prepare_ohlcv(df)
+    # Attach all indicator columns in one concat instead of one write each
+    indicators = pd.DataFrame(indicator_arrays(df), index=df.index)
+    return pd.concat([df, indicators], axis=1)
+
+
+def analyze_ticker(df, market_ctx=None):
+    """
+    Applies the swing trading strategy to the dataframe.
+    """
+    if df is None or len(df) < min_history_bars():
+        return None
 
-    df.loc[:, "Vol_Avg"] = volume.rolling(window=config.VOL_AVG_PERIOD).mean()
+    df = prepare_ohlcv(df)
 
     if len(df) < 2:
         return None
 
+    # Only the last two bars are read, so skip the full indicator series
+    indicators, _ = _indicator_tail(df, bars=2)
+
     # Get latest values
-    last_row = df.iloc[-1]
-    prev_row = df.iloc[-2]
+    last_row = {name: values[-1] for name, values in indicators.items()}
+    prev_row = {name: values[-2] for name, values in indicators.items()}
 
-    # Primary Signal: Golden Cross (EMA20 crosses above EMA50)
-    crossover_today = (last_row["EMA_Fast"] > last_row["EMA_Slow"]) and (
-        prev_row["EMA_Fast"] <= prev_row["EMA_Slow"]
-    )
+    weekly_ctx = None
+    if config.ENABLE_MTF or config.ENABLE_MARKET_FILTER:
+        weekly_ctx = analyze_weekly_trend(to_weekly(df))
+
+    return _build_analysis(df, last_row, prev_row, weekly_ctx, market_ctx)
+
+
+def _build_analysis(df, last_row, prev_row, weekly_ctx, market_ctx):
+    """
+    Turn the indicator values of the last two bars into the analysis dict.
+
+    Args:
+        df: Prepared OHLCV frame; only its last SWING_LOOKBACK rows are read
+        last_row: Indicator name -> value on the latest bar
+        prev_row: Indicator name -> value on the bar before
+        weekly_ctx: analyze_weekly_trend() result, or None when neither the
+            weekly nor the market filter is enabled
+        market_ctx: analyze_market_regime() result (optional)
+    """
+    crossover_today = bool(last_row["Is_Setup"])
 
     current_price = float(last_row["Close"])
-    atr_value = float(last_row["ATR"])
 
     stop_loss = 0.0
     take_profit_min = 0.0
     take_profit_max = 0.0
     is_setup = False
 
-    # Target SL/TP calculation (used for BUY setups and UPTREND reference)
-    def get_risk_levels(price, atr):
-        sl = price - (atr * config.ATR_MULTIPLIER)
-        # Sanity check for SL
-        if sl > price:
-            sl = price * (1 - config.STOP_LOSS_PCT)
-        tp_min = price * (1 + config.TARGET_PROFIT_MIN)
-        tp_max = price * (1 + config.TARGET_PROFIT_MAX)
-        return sl, tp_min, tp_max
-
     if crossover_today:
         is_setup = True
         reasons = []
@@ -475,27 +1096,25 @@ def analyze_ticker(df, market_ctx=None):
             reasons.append("Bearish MACD")
 
         # Filter 3: Volume Confirmation
-        vol_ratio = (
-            last_row["Volume"] / last_row["Vol_Avg"] if last_row["Vol_Avg"] > 0 else 0
-        )
+        vol_ratio = last_row["Vol_Ratio"]
         if config.VOLUME_STRICT_FILTER:
             if vol_ratio < config.VOL_RATIO_MIN:
                 is_buy = False
                 reasons.append(f"Low Vol ({vol_ratio:.1f}x)")
 
         signal = "BUY" if is_buy else f"WAIT ({', '.join(reasons)})"
-        stop_loss, take_profit_min, take_profit_max = get_risk_levels(
-            current_price, atr_value
-        )
+        stop_loss = float(last_row["Stop_Loss"])
+        take_profit_min = float(last_row["Take_Profit_Min"])
+        take_profit_max = float(last_row["Take_Profit_Max"])
 
     else:
         # No crossover today
         if last_row["EMA_Fast"] > last_row["EMA_Slow"]:
             signal = "UPTREND (No Cross)"
             # Reference SL/TP for UPTREND
-            stop_loss, take_profit_min, take_profit_max = get_risk_levels(
-                current_price, atr_value
-            )
+            stop_loss = float(last_row["Stop_Loss"])
+            take_profit_min = float(last_row["Take_Profit_Min"])
+            take_profit_max = float(last_row["Take_Profit_Max"])
         else:
             signal = "DOWNTREND"
             stop_loss, take_profit_min, take_profit_max = 0.0, 0.0, 0.0
@@ -508,7 +1127,7 @@ def analyze_ticker(df, market_ctx=None):
     )
 
     pivot_data = calculate_pivot_points(df)
-    swing_data = find_swing_levels(df, lookback=20)
+    swing_data = find_swing_levels(df, lookback=SWING_LOOKBACK)
     sr_analysis = analyze_support_resistance(current_price, pivot_data, swing_data)
 
     # Calculate slopes (current - previous)
@@ -545,16 +1164,16 @@ def analyze_ticker(df, market_ctx=None):
         "is_setup": is_setup,
         "current_price": current_price,
         "ideal_entry": current_price,
-        "target_profit_range": f"{config.TARGET_PROFIT_MIN * 100:.0f}-{config.TARGET_PROFIT_MAX * 100:.0f}%",
+        "target_profit_range": _target_profit_range(
+            config.TARGET_PROFIT_MIN, config.TARGET_PROFIT_MAX
+        ),
         "rsi": last_row["RSI"],
         "macd_hist": last_row["MACD_Hist"],
         "macd_hist_slope": macd_hist_slope,
         "rsi_slope": rsi_slope,
         "ema_spread_slope": ema_spread_slope,
         "movement_summary": movement_summary,
-        "vol_ratio": last_row["Volume"] / last_row["Vol_Avg"]
-        if last_row["Vol_Avg"] > 0
-        else 0,
+        "vol_ratio": last_row["Vol_Ratio"],
         "stop_loss": stop_loss,
         "take_profit_min": take_profit_min,
         "take_profit_max": take_profit_max,
@@ -565,12 +1184,11 @@ def analyze_ticker(df, market_ctx=None):
         "sr_score": sr_analysis["sr_score"],
     }
 
-    if config.ENABLE_MTF or config.ENABLE_MARKET_FILTER:
-        weekly_df = to_weekly(df)
-        weekly_ctx = analyze_weekly_trend(weekly_df)
+    if weekly_ctx is not None:
         base_analysis = combine_signals(base_analysis, weekly_ctx, market_ctx)
     else:
         base_analysis["final_signal"] = signal
+        base_analysis["signal_flags"] = signal_flags(signal)
         base_analysis["weekly_trend"] = None
         base_analysis["market_regime"] = None
         base_analysis["score"] = 0
@@ -581,3 +1199,321 @@ def analyze_ticker(df, market_ctx=None):
         )
 
     return base_analysis
+
+
+@dataclass
+class StrategyState:
+    """
+    Running indicator state for one ticker as of its latest bar.
+
+    Every indicator is a recurrence (EMA, Wilder average) or a fixed window
+    (ATR, volume average), so the next bar can be folded in with one step
+    each instead of recomputing the full history; see analyze_incremental().
+    """
+
+    last_timestamp: pd.Timestamp
+    ema_fast: float
+    ema_slow: float
+    macd_fast: float
+    macd_slow: float
+    macd_signal: float
+    avg_gain: float
+    avg_loss: float
+    tr_window: np.ndarray  # Last ATR_PERIOD true ranges, oldest first
+    vol_window: np.ndarray  # Last VOL_AVG_PERIOD volumes, oldest first
+    row: dict  # Indicator values on the latest bar
+    bars: pd.DataFrame  # Last SWING_LOOKBACK OHLCV bars (pivots, swings, patterns)
+    weekly_ema_fast: float  # Weekly EMAs over completed weeks (NaN before the first)
+    weekly_ema_slow: float
+    week_end: pd.Timestamp  # W-FRI label of the week in progress
+    week_close: float  # Latest close of the week in progress
+    weeks: int  # Weekly candles so far, including the one in progress
+    fingerprint: tuple  # state_fingerprint() of the settings that built it
+    previous: "StrategyState | None" = None  # State before the latest bar
+
+
+# Bump when StrategyState's fields or recurrences change meaning
+STATE_VERSION = 1
+
+
+def state_fingerprint():
+    """
+    Format version plus every setting a StrategyState's values depend on.
+    A state saved under a different fingerprint is never resumed, since
+    stepping it would keep the old periods forever.
+    """
+    return (
+        STATE_VERSION,
+        SWING_LOOKBACK,
+        config.INDICATOR_DTYPE,
+        config.FAST_EMA,
+        config.SLOW_EMA,
+        config.RSI_PERIOD,
+        config.MACD_FAST,
+        config.MACD_SLOW,
+        config.MACD_SIGNAL,
+        config.ATR_PERIOD,
+        config.ATR_MULTIPLIER,
+        config.STOP_LOSS_PCT,
+        config.VOL_AVG_PERIOD,
+        config.TARGET_PROFIT_MIN,
+        config.TARGET_PROFIT_MAX,
+        config.WEEKLY_FAST_EMA,
+        config.WEEKLY_SLOW_EMA,
+    )
+
+
+def _week_label(timestamp):
+    """
+    W-FRI resample label (the week's Friday) of a daily timestamp.
+    """
+    return timestamp.normalize() + pd.Timedelta(days=(4 - timestamp.weekday()) % 7)
+
+
+def init_state(df):
+    """
+    Build a StrategyState from a prepared OHLCV frame (the cold-start path).
+    """
+    alphas = _config_alphas()
+    indicators, recurrences = _indicator_tail(df, bars=1)
+    weekly_close = _float_values(to_weekly(df)["Close"])
+    completed = weekly_close[:-1]
+
+    def last(values):
+        return float(values[-1]) if len(values) else np.nan
+
+    return StrategyState(
+        last_timestamp=df.index[-1],
+        ema_fast=float(indicators["EMA_Fast"][-1]),
+        ema_slow=float(indicators["EMA_Slow"][-1]),
+        macd_signal=float(indicators["MACD_Signal"][-1]),
+        **recurrences,
+        tr_window=_true_range(df.iloc[-(config.ATR_PERIOD + 1) :])[
+            -config.ATR_PERIOD :
+        ].astype(np.float64),
+        vol_window=_float_values(df["Volume"])[-config.VOL_AVG_PERIOD :].astype(
+            np.float64
+        ),
+        row={name: values[-1] for name, values in indicators.items()},
+        bars=df.iloc[-SWING_LOOKBACK:],
+        weekly_ema_fast=last(_ema(completed, alphas["weekly_fast"])),
+        weekly_ema_slow=last(_ema(completed, alphas["weekly_slow"])),
+        week_end=_week_label(df.index[-1]),
+        week_close=float(weekly_close[-1]),
+        weeks=len(weekly_close),
+        fingerprint=state_fingerprint(),
+    )
+
+
+def advance_state(state, bar):
+    """
+    Fold one new bar into a state: a single recurrence step per indicator.
+
+    Args:
+        state: StrategyState as of the bar before `bar`
+        bar: One-row prepared OHLCV frame
+
+    Returns:
+        New StrategyState whose `previous` is `state`
+    """
+    timestamp = bar.index[-1]
+    close, high, low, volume = (
+        float(bar[col].iat[-1]) for col in ("Close", "High", "Low", "Volume")
+    )
+    prev_close = float(state.row["Close"])
+
+    alphas = _config_alphas()
+    ema_fast = _ema_step(state.ema_fast, close, alphas["fast"])
+    ema_slow = _ema_step(state.ema_slow, close, alphas["slow"])
+    macd_fast = _ema_step(state.macd_fast, close, alphas["macd_fast"])
+    macd_slow = _ema_step(state.macd_slow, close, alphas["macd_slow"])
+    macd = macd_fast - macd_slow
+    macd_signal = _ema_step(state.macd_signal, macd, alphas["macd_signal"])
+
+    period = config.RSI_PERIOD
+    delta = close - prev_close
+    avg_gain = (state.avg_gain * (period - 1) + max(delta, 0.0)) / period
+    avg_loss = (state.avg_loss * (period - 1) + max(-delta, 0.0)) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = float(100 - (100 / (1 + np.float64(avg_gain) / avg_loss)))
+
+    tr = np.fmax(
+        np.fmax(high - low, abs(high - prev_close)), abs(low - prev_close)
+    )
+    tr_window = np.append(state.tr_window[1:], tr)
+    vol_window = np.append(state.vol_window[1:], volume)
+    atr = float(tr_window.mean())
+    vol_avg = float(vol_window.mean())
+
+    stop_loss = close - (atr * config.ATR_MULTIPLIER)
+    if stop_loss > close:
+        stop_loss = close * (1 - config.STOP_LOSS_PCT)
+
+    row = {
+        "EMA_Fast": ema_fast,
+        "EMA_Slow": ema_slow,
+        "RSI": rsi,
+        "ATR": atr,
+        "MACD": macd,
+        "MACD_Signal": macd_signal,
+        "MACD_Hist": macd - macd_signal,
+        "Vol_Avg": vol_avg,
+        "Vol_Ratio": volume / vol_avg if vol_avg > 0 else 0.0,
+        "Is_Setup": ema_fast > ema_slow
+        and state.row["EMA_Fast"] <= state.row["EMA_Slow"],
+        "Stop_Loss": stop_loss,
+        "Take_Profit_Min": close * (1 + config.TARGET_PROFIT_MIN),
+        "Take_Profit_Max": close * (1 + config.TARGET_PROFIT_MAX),
+        "Close": close,
+    }
+
+    # A bar in a later week closes out the week in progress
+    weekly_ema_fast, weekly_ema_slow = state.weekly_ema_fast, state.weekly_ema_slow
+    week_end, weeks = _week_label(timestamp), state.weeks
+    if week_end > state.week_end:
+        weekly_ema_fast = _ema_step(
+            weekly_ema_fast, state.week_close, alphas["weekly_fast"]
+        )
+        weekly_ema_slow = _ema_step(
+            weekly_ema_slow, state.week_close, alphas["weekly_slow"]
+        )
+        weeks += 1
+
+    return StrategyState(
+        last_timestamp=timestamp,
+        ema_fast=ema_fast,
+        ema_slow=ema_slow,
+        macd_fast=macd_fast,
+        macd_slow=macd_slow,
+        macd_signal=macd_signal,
+        avg_gain=avg_gain,
+        avg_loss=avg_loss,
+        tr_window=tr_window,
+        vol_window=vol_window,
+        row=row,
+        bars=pd.concat([state.bars.iloc[-(SWING_LOOKBACK - 1) :], bar]),
+        weekly_ema_fast=weekly_ema_fast,
+        weekly_ema_slow=weekly_ema_slow,
+        week_end=max(week_end, state.week_end),
+        week_close=close,
+        weeks=weeks,
+        fingerprint=state.fingerprint,
+        previous=replace(state, previous=None),
+    )
+
+
+def _weekly_context(state):
+    """
+    analyze_weekly_trend() equivalent computed from a StrategyState.
+    """
+    if state.weeks < config.WEEKLY_SLOW_EMA + 5:
+        return {"weekly_trend": "UNKNOWN", "weekly_aligned": True}
+
+    alphas = _config_alphas()
+    ema_fast = _ema_step(state.weekly_ema_fast, state.week_close, alphas["weekly_fast"])
+    ema_slow = _ema_step(state.weekly_ema_slow, state.week_close, alphas["weekly_slow"])
+    aligned = bool(ema_fast > ema_slow)
+    trend = "UP" if aligned else "DOWN"
+    return {"weekly_trend": trend, "weekly_aligned": aligned}
+
+
+def _resume_point(state, tail):
+    """
+    State as of tail's second-to-last bar, or None if `state` cannot be
+    resumed for this data (other dates, prices re-adjusted since, or built
+    under other indicator settings).
+
+    Re-running on the same bar (an intraday refresh replaces the forming
+    candle) resumes from the state before that bar.
+    """
+    if state is None or len(tail) < 2:
+        return None
+    if state.fingerprint != state_fingerprint():
+        return None
+    if state.last_timestamp == tail.index[-1]:
+        state = state.previous
+    if state is None or state.last_timestamp != tail.index[-2]:
+        return None
+    if not np.isclose(state.row["Close"], tail["Close"].iloc[-2], rtol=1e-6):
+        return None
+    return state
+
+
+def update_analysis(state, new_bar, market_ctx=None):
+    """
+    Analyze a ticker after one new bar, starting from the previous state.
+
+    Args:
+        state: StrategyState as of the bar before new_bar
+        new_bar: One-row prepared OHLCV frame (index = bar timestamp)
+        market_ctx: analyze_market_regime() result (optional)
+
+    Returns:
+        Tuple of (analysis dict as from analyze_ticker, new StrategyState)
+    """
+    new_state = advance_state(state, new_bar)
+
+    weekly_ctx = None
+    if config.ENABLE_MTF or config.ENABLE_MARKET_FILTER:
+        weekly_ctx = _weekly_context(new_state)
+
+    analysis = _build_analysis(
+        new_state.bars, new_state.row, state.row, weekly_ctx, market_ctx
+    )
+    return analysis, new_state
+
+
+def analyze_incremental(df, state=None, market_ctx=None):
+    """
+    analyze_ticker() that reuses a saved StrategyState when it lines up with
+    df, touching only the last two bars instead of the whole history.
+
+    Without a usable state (first run, gap in the data, re-adjusted prices)
+    this falls back to the full computation and returns a fresh state.
+    Results match analyze_ticker() up to float rounding in the rolling
+    means and the EMA seed (the state carries history from before df's
+    first bar).
+
+    Returns:
+        Tuple of (analysis dict or None, StrategyState or None)
+    """
+    if df is None or len(df) < min_history_bars():
+        return None, None
+
+    tail = prepare_ohlcv(df.iloc[-2:])
+    base = _resume_point(state, tail)
+    if base is None:
+        # Cold start: full history up to the previous bar, then one step
+        df = prepare_ohlcv(df)
+        if len(df) < 2:
+            return None, None
+        base, tail = init_state(df.iloc[:-1]), df.iloc[-1:]
+
+    return update_analysis(base, tail.iloc[-1:], market_ctx=market_ctx)
+
+
+def load_states(path):
+    """
+    Saved StrategyState per ticker; an empty dict if the file is missing,
+    unreadable or was written under other indicator settings.
+    """
+    try:
+        with open(path, "rb") as f:
+            fingerprint, states = pickle.load(f)
+    except Exception:
+        return {}
+    return states if fingerprint == state_fingerprint() else {}
+
+
+def save_states(states, path):
+    """
+    Pickle a ticker -> StrategyState mapping, tagged with the current
+    state_fingerprint() (atomically, via a temp file).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(
+            (state_fingerprint(), states), f, protocol=pickle.HIGHEST_PROTOCOL
+        )
+    os.replace(tmp_path, path)
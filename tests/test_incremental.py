@@ -0,0 +1,58 @@
+import math
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import config, strategy
+from src.precompile import synthetic_ohlcv
+
+
+def assert_same_analysis(case, expected, actual):
+    case.assertEqual(expected.keys(), actual.keys())
+    for key, value in expected.items():
+        if isinstance(value, float):
+            case.assertTrue(
+                math.isclose(value, actual[key], rel_tol=1e-9, abs_tol=1e-9)
+                or (math.isnan(value) and math.isnan(actual[key])),
+                f"{key}: {value} != {actual[key]}",
+            )
+        else:
+            case.assertEqual(value, actual[key], key)
+
+
+class IncrementalAnalysisTest(unittest.TestCase):
+    def test_chained_state_matches_full_analysis(self):
+        df = synthetic_ohlcv()
+        state = None
+        for end in range(len(df) - 5, len(df) + 1):
+            analysis, state = strategy.analyze_incremental(df.iloc[:end], state)
+        assert_same_analysis(self, strategy.analyze_ticker(df), analysis)
+
+    def test_config_change_discards_saved_state(self):
+        df = synthetic_ohlcv()
+        _, state = strategy.analyze_incremental(df.iloc[:-3])
+
+        # Daily scans after the EMA periods were edited
+        with mock.patch.multiple(config, FAST_EMA=5, SLOW_EMA=13):
+            for end in range(len(df) - 2, len(df) + 1):
+                analysis, state = strategy.analyze_incremental(df.iloc[:end], state)
+            expected = strategy.analyze_ticker(df)
+        assert_same_analysis(self, expected, analysis)
+
+    def test_load_states_rejects_other_settings(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "strategy_state.pkl")
+        _, state = strategy.analyze_incremental(synthetic_ohlcv())
+        strategy.save_states({"TEST": state}, path)
+        self.assertIn("TEST", strategy.load_states(path))
+        with mock.patch.object(config, "VOL_AVG_PERIOD", config.VOL_AVG_PERIOD + 1):
+            self.assertEqual(strategy.load_states(path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()